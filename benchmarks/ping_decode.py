@@ -0,0 +1,124 @@
+"""Сравнение затрат процессора долбилки на один светофор: прежняя обработка ответа
+с двойным разбором JSON и текущая с одним разбором через JsonCodec.
+
+Сеть не используется: _send возвращает заранее подготовленный ответ, поэтому измеряется
+только подготовка запроса, разбор ответа и обновление состояния светофора.
+
+Запуск из корня проекта:
+    python -m benchmarks.ping_decode
+"""
+import argparse
+import json
+import timeit
+from typing import Optional
+
+import requests
+
+from src.modules import TrafficLightData
+from src.pinger import Pinger
+from src.pinger import json_codec
+
+
+class BenchPinger(Pinger):
+    """Долбилка, которая вместо запроса к сервису возвращает готовый ответ.
+    """
+
+    def __init__(self, content: bytes):
+        super().__init__()
+        self.response: requests.Response = requests.Response()
+        self.response.status_code = 200
+        self.response._content = content
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.response
+
+
+class LegacyPinger(BenchPinger):
+    """Прежний Pinger._ping_traffic_light(): параметры запроса собираются дважды,
+    а ответ разбирается json.loads() для состояния и ещё раз для проверки.
+    """
+
+    def _ping_traffic_light(self, data: TrafficLightData, checks: dict[str, tuple[dict, dict]]) -> \
+            Optional[tuple[bool, str, int]]:
+        if not self.get_circuit_breaker(data.url).allow_request():
+            return False, 'Сервис отключён после нескольких неудачных попыток соединения', -1
+        response = self._send('GET', data.url, params={
+            'type': str(data.type_value),
+            'data': json.dumps({
+                'uuid': str(data.uuid),
+                'current_time': data.current_time,
+                'current_state': data.get_state() + 1
+            })
+        })
+        if 500 <= response.status_code <= 599:
+            return False, 'Сервер упал с 500-ой ошибкой', response.status_code
+        if 400 <= response.status_code <= 499:
+            return False, 'Сервер вернул 400-ую ошибку', response.status_code
+
+        data.advance(int(json.loads(response.content)['next_state']) - 1)
+
+        checks[data.uuid] = {
+            'type': str(data.type_value),
+            'data': {
+                'uuid': str(data.uuid),
+                'current_time': data.current_time,
+                'current_state': data.get_state() + 1
+            }
+        }, json.loads(response.content)
+        return True, None, response.status_code
+
+
+def get_content(extra_fields: int) -> bytes:
+    """Ответ сервиса с состоянием светофора и дополнительными полями, которые читает проверка.
+    """
+    content: dict = {'next_state': 2}
+    for i in range(extra_fields):
+        content[f'field_{i}'] = {'value': i, 'name': f'segment_{i}', 'enabled': i % 2 == 0}
+    return json.dumps(content).encode()
+
+
+def measure(pinger: Pinger, lights: list[TrafficLightData], number: int) -> float:
+    """Среднее время обработки одного светофора в микросекундах.
+    """
+    checks: dict[str, tuple[dict, dict]] = {}
+
+    def run():
+        for data in lights:
+            pinger._ping_traffic_light(data, checks)
+
+    return timeit.timeit(run, number=number) / number / len(lights) * 1_000_000
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Сравнение обработки ответов сервиса')
+    parser.add_argument('--lights', type=int, default=1000, help='Количество светофоров')
+    parser.add_argument('--number', type=int, default=20, help='Количество повторов')
+    parser.add_argument('--extra-fields', type=int, default=20, help='Количество дополнительных полей в ответе')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    content: bytes = get_content(args.extra_fields)
+    lights: list[TrafficLightData] = [TrafficLightData('basic', f'light_{i}') for i in range(args.lights)]
+
+    legacy_time: float = measure(LegacyPinger(content), lights, args.number)
+    print(f'{"Обработка":<32} {"мкс/светофор":>13} {"Ускорение":>10}')
+    print(f'{"Прежняя (json, 2 разбора)":<32} {legacy_time:>13.2f} {1:>9.1f}x')
+
+    backends: list[Optional[object]] = [None] if json_codec.orjson is None else [None, json_codec.orjson]
+    installed: Optional[object] = json_codec.orjson
+    try:
+        for backend in backends:
+            json_codec.orjson = backend
+            current_time: float = measure(BenchPinger(content), lights, args.number)
+            name: str = f'Текущая ({"json" if backend is None else "orjson"}, 1 разбор)'
+            print(f'{name:<32} {current_time:>13.2f} {legacy_time / current_time:>9.1f}x')
+    finally:
+        json_codec.orjson = installed
+    if installed is None:
+        print('orjson не установлен, JsonCodec использует json')
+
+
+if __name__ == '__main__':
+    main()
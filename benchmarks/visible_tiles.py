@@ -0,0 +1,110 @@
+"""Сравнение вычисления видимых тайлов: прежний обход от центра экрана и VisibleTiles.
+
+Запуск из корня проекта:
+    python -m benchmarks.visible_tiles
+"""
+import argparse
+import timeit
+from math import cos, sin
+
+from src.modules import VisibleTiles
+
+
+class LegacyWalk:
+    """Прежний обход Field._update_tiles(): от центрального тайла экрана по строкам и столбцам,
+    пока тайлы не выйдут за границы экрана.
+    """
+
+    def __init__(self, camera_offset: tuple[int, int], camera_distance: float, perspective_angle: float = 0.52,
+                 tile_size: int = 10, pixel_size: int = 9):
+        self.camera_offset: tuple[int, int] = camera_offset
+        self.camera_distance: float = camera_distance
+        self.perspective_angle: float = perspective_angle
+        self.tile_size: int = tile_size
+        self.pixel_size: int = pixel_size
+
+    def get_half_of_tile_size(self) -> tuple[int, int]:
+        return (round(self.tile_size * self.pixel_size * cos(self.perspective_angle) * self.camera_distance),
+                round(self.tile_size * self.pixel_size * sin(self.perspective_angle) * self.camera_distance))
+
+    def get_offset_from_coordinates(self, coord: tuple[int, int]) -> tuple[int, int]:
+        return (self.camera_offset[0] + self.get_half_of_tile_size()[0] * (coord[0] + coord[1]),
+                self.camera_offset[1] + self.get_half_of_tile_size()[1] * (coord[1] - coord[0]))
+
+    def get_tile_position_by_coordinates(self, coord: tuple[int, int]) -> tuple[int, int]:
+        wx = coord[0] - self.get_offset_from_coordinates((0, 0))[0]
+        wy = coord[1] - self.get_offset_from_coordinates((0, 0))[1]
+        ux = self._get_zero_vector()[0][0] * 2
+        uy = self._get_zero_vector()[0][1] * 2
+        vx = self._get_zero_vector()[1][0] * 2
+        vy = self._get_zero_vector()[1][1] * 2
+
+        coord = round((wx * vy - wy * vx) / (ux * vy - uy * vx)), round((ux * wy - uy * wx) / (ux * vy - uy * vx)) - 1
+        while self._does_tile_extend_beyond_field(coord):
+            coord = (coord[0], coord[1] + 1)
+        return coord
+
+    def get_visible_tiles(self) -> list[tuple[int, int]]:
+        updated_pos: list[tuple[int, int]] = []
+        coord: tuple[int, int] = self._get_position_of_beginning_of_construction()
+
+        for delta_y in [1, -1]:
+            coord = (coord[0], self._get_position_of_beginning_of_construction()[1])
+            while not self._does_tile_extend_beyond_field(coord):
+                updated_pos.append(coord)
+                coord = (self._get_position_of_beginning_of_construction()[0], coord[1])
+                for delta_x in [1, -1]:
+                    while not self._does_tile_extend_beyond_field(coord):
+                        coord = (coord[0] + delta_x, coord[1])
+                        updated_pos.append(coord)
+                    coord = (self._get_position_of_beginning_of_construction()[0], coord[1])
+                coord = (coord[0], coord[1] + delta_y)
+        return updated_pos
+
+    def _get_zero_vector(self) -> tuple[tuple[int, int], tuple[int, int]]:
+        yx = round(self.get_half_of_tile_size()[0] / 2)
+        yy = round(self.get_half_of_tile_size()[1] / 2)
+        xx = round(self.get_half_of_tile_size()[0] / 2)
+        xy = -round(self.get_half_of_tile_size()[1] / 2)
+        return (xx, xy), (yx, yy)
+
+    def _get_position_of_beginning_of_construction(self) -> tuple[int, int]:
+        return self.get_tile_position_by_coordinates((960, 540))
+
+    def _does_tile_extend_beyond_field(self, coord: tuple[int, int]) -> bool:
+        return not (self.get_offset_from_coordinates(coord)[0] < 1920 and self.get_offset_from_coordinates(coord)[
+            1] < 1080
+                    and self.get_offset_from_coordinates(coord)[0] + 2 * self.get_half_of_tile_size()[0] > 0 and
+                    self.get_offset_from_coordinates(coord)[1] + 2 * self.get_half_of_tile_size()[1] > 0)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Сравнение вычисления видимых тайлов')
+    parser.add_argument('--number', type=int, default=50, help='Количество повторов для каждого масштаба')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    print(f'{"Отдаление":>10} {"Тайлов":>8} {"Обход, мс":>10} {"VisibleTiles, мс":>17} {"Ускорение":>10}')
+    for camera_distance in (0.5, 1, 1.5, 2):
+        walk = LegacyWalk((-300, 400), camera_distance)
+        half_of_tile_size: tuple[int, int] = walk.get_half_of_tile_size()
+        visible_tiles = VisibleTiles.from_view(walk.camera_offset, half_of_tile_size)
+
+        walked: set[tuple[int, int]] = {pos for pos in walk.get_visible_tiles()
+                                        if not walk._does_tile_extend_beyond_field(pos)}
+        missing: set[tuple[int, int]] = walked - set(visible_tiles)
+        if missing:
+            raise AssertionError(f'VisibleTiles не нашёл видимые тайлы: {sorted(missing)[:5]}')
+
+        walk_time: float = timeit.timeit(walk.get_visible_tiles, number=args.number) / args.number
+        spans_time: float = timeit.timeit(
+            lambda: list(VisibleTiles.from_view(walk.camera_offset, walk.get_half_of_tile_size())),
+            number=args.number) / args.number
+        print(f'{camera_distance:>10} {len(visible_tiles):>8} {walk_time * 1000:>10.3f} {spans_time * 1000:>17.3f} '
+              f'{walk_time / spans_time:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+"""
+Нагрузочное тестирование сервиса светофоров без графического интерфейса.
+
+Загружает сохранённый город из saves/cities, создаёт данные для каждого его светофора
+и пингует сервис с заданной частотой в течение заданного времени. По завершении
+выводит пропускную способность, долю ошибок и перцентили задержки запросов.
+
+Модуль не импортирует pygame, поэтому может запускаться в CI.
+
+С флагом --mock вместо внешнего сервиса запускается локальный MockTrafficLightService
+на адресах из типов светофоров города, что даёт воспроизводимый базовый замер.
+
+Пример:
+    python loadtest.py moscow --rate 2 --duration 60 --concurrency 64
+    python loadtest.py moscow --mock --mock-latency 0.01 --mock-error-rate 0.05
+"""
+import argparse
+import subprocess
+import json
+import logging
+import sys
+import threading
+import time
+from math import ceil
+from os import path
+from typing import Optional
+from urllib.parse import urlparse
+
+from src.modules import TrafficLightData
+from src.pinger import Pinger
+from src.pinger.mock_service import MockTrafficLightService
+
+# - - - - - Импорт НЕ УДАЛЯТЬ. Нужен чтобы проверки из check/master.py были зарегистрированы
+from check import master  # pylint: disable=unused-import
+
+# - - - - -
+
+
+class LoadStats:
+    """Статистика нагрузочного теста.
+
+    Attributes:
+        latencies (list[float]): Время выполнения каждого HTTP-запроса в секундах
+        http_errors (int): Количество HTTP-запросов без ответа или с ответом 4xx/5xx
+        http_errors_by_status (dict[int, int]): Количество таких запросов по статус коду (-1, если ответа нет)
+        checks (int): Количество проверенных светофоров
+        failed_checks (int): Количество светофоров, не прошедших проверку
+        unchecked (int): Количество светофоров, для типа которых нет проверки
+        ticks (int): Количество выполненных тиков
+    """
+
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.http_errors: int = 0
+        self.http_errors_by_status: dict[int, int] = {}
+        self.checks: int = 0
+        self.failed_checks: int = 0
+        self.unchecked: int = 0
+        self.ticks: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def on_response(self, _url: str, status_code: int, elapsed: float):
+        """Учёт HTTP-запроса. Вызывается долбилкой из потоков пула.
+        """
+        with self._lock:
+            self.latencies.append(elapsed)
+            if status_code == -1 or status_code >= 400:
+                self.http_errors += 1
+                self.http_errors_by_status[status_code] = self.http_errors_by_status.get(status_code, 0) + 1
+
+    def add_tick(self, results: dict[str, Optional[tuple[bool, str, int]]]):
+        """Учёт результатов одного тика.
+
+        Args:
+            results: Результаты Pinger.ping()
+        """
+        self.ticks += 1
+        for result in results.values():
+            self.checks += 1
+            if result is None:
+                self.unchecked += 1
+            elif not result[0]:
+                self.failed_checks += 1
+
+    def get_error_rate(self) -> float:
+        return self.failed_checks / self.checks if self.checks else 0
+
+    def get_percentile(self, percent: float) -> float:
+        """Получение перцентиля задержки HTTP-запросов в секундах.
+        """
+        if not self.latencies:
+            return 0
+        latencies: list[float] = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, max(0, ceil(percent / 100 * len(latencies)) - 1))]
+
+    def report(self, traffic_lights: int, duration: float) -> str:
+        """Получение отчёта о тесте.
+
+        Args:
+            traffic_lights: Количество светофоров в городе
+            duration: Фактическая длительность теста в секундах
+        """
+        duration = max(duration, 1e-9)
+        lines: list[str] = [
+            f'Светофоров: {traffic_lights}, тиков: {self.ticks}, длительность: {duration:.2f} с',
+            f'Пропускная способность: {self.checks / duration:.1f} проверок/с, '
+            f'{len(self.latencies) / duration:.1f} HTTP-запросов/с',
+            f'Доля ошибок: {self.get_error_rate() * 100:.2f}% '
+            f'({self.failed_checks} из {self.checks}, без проверки: {self.unchecked}, '
+            f'ошибок HTTP: {self.http_errors})',
+            'Задержка HTTP-запросов: ' + ', '.join(
+                f'p{percent}={self.get_percentile(percent) * 1000:.1f} мс' for percent in (50, 90, 95, 99)
+            ) + f', max={max(self.latencies, default=0) * 1000:.1f} мс',
+        ]
+        if self.http_errors_by_status:
+            lines.append('Ошибки HTTP по статус коду: ' + ', '.join(
+                f'{"нет ответа" if status_code == -1 else status_code}: {count}'
+                for status_code, count in sorted(self.http_errors_by_status.items())))
+        return '\n'.join(lines)
+
+
+def load_city(city: str) -> dict:
+    """Загрузка сохранённого города.
+
+    Args:
+        city: Название города из saves/cities или путь к файлу города
+    """
+    city_path: str = city if path.isfile(city) else path.join('saves', 'cities', f'{city}.json')
+    with open(city_path, 'r') as file:
+        return json.loads(file.read())
+
+
+def create_traffic_lights_data(city: dict) -> list[TrafficLightData]:
+    """Создание данных для всех светофоров города.
+
+    Args:
+        city: Данные сохранённого города
+    """
+    traffic_lights_data: list[TrafficLightData] = []
+    traffic_lights: dict[str, list[list[int]]] = city['traffic_lights'] or {}
+    for tfl_type, positions in traffic_lights.items():
+        for pos in positions:
+            traffic_lights_data.append(TrafficLightData(tfl_type, f'{tfl_type}_{pos[0]}_{pos[1]}'))
+    return traffic_lights_data
+
+
+def start_mock_services(traffic_lights_data: list[TrafficLightData], latency: float,
+                        error_rate: float) -> list[subprocess.Popen]:
+    """Запуск локального сервиса светофоров на каждом адресе, который используют светофоры.
+
+    Args:
+        traffic_lights_data: Данные светофоров
+        latency: Задержка ответа в секундах
+        error_rate: Доля ответов с ошибкой 500
+    """
+    urls: dict[str, str] = {}
+    for data in traffic_lights_data:
+        url = urlparse(data.url)
+        urls.setdefault(url.netloc, url.path)
+
+    processes: list[subprocess.Popen] = []
+    try:
+        for netloc, way in urls.items():
+            host, _, port = netloc.partition(':')
+            processes.append(MockTrafficLightService.spawn(int(port or 80), host=host, path=way,
+                                                           latency=latency, error_rate=error_rate))
+    except Exception:
+        stop_mock_services(processes)
+        raise
+    return processes
+
+
+def stop_mock_services(processes: list[subprocess.Popen]):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.wait()
+
+
+def run(pinger: Pinger, stats: LoadStats, rate: float, duration: float) -> float:
+    """Пинг светофоров с частотой rate тиков в секунду в течение duration секунд.
+
+    Returns:
+        float: Фактическая длительность теста в секундах
+    """
+    started_at: float = time.perf_counter()
+    next_tick: float = started_at
+    while time.perf_counter() - started_at < duration:
+        stats.add_tick(pinger.ping())
+        next_tick += 1 / rate
+        delay: float = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(min(delay, max(0.0, started_at + duration - time.perf_counter())))
+        else:
+            next_tick = time.perf_counter()
+    return time.perf_counter() - started_at
+
+
+def parse_args(args: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Нагрузочное тестирование сервиса светофоров без графики.')
+    parser.add_argument('city', help='Название города из saves/cities или путь к файлу города')
+    parser.add_argument('--rate', type=float, default=1, help='Количество тиков в секунду')
+    parser.add_argument('--duration', type=float, default=10, help='Длительность теста в секундах')
+    parser.add_argument('--concurrency', type=int, default=32, help='Максимум одновременных запросов')
+    parser.add_argument('--pool-size', type=int, default=32, help='Размер пула соединений одного url')
+    parser.add_argument('--connect-timeout', type=float, default=1, help='Таймаут соединения в секундах')
+    parser.add_argument('--read-timeout', type=float, default=2, help='Таймаут ответа в секундах')
+    parser.add_argument('--retries', type=int, default=2, help='Количество повторных попыток')
+    parser.add_argument('--check-in-processes', action='store_true',
+                        help='Выполнять проверки check/master.py в пуле процессов')
+    parser.add_argument('--check-timeout', type=float, default=1, help='Таймаут проверки в пуле процессов в секундах')
+    parser.add_argument('--mock', action='store_true',
+                        help='Запустить локальный сервис светофоров вместо внешнего')
+    parser.add_argument('--mock-latency', type=float, default=0, help='Задержка ответа локального сервиса в секундах')
+    parser.add_argument('--mock-error-rate', type=float, default=0, help='Доля ответов локального сервиса с ошибкой 500')
+    parser.add_argument('--max-error-rate', type=float, default=None,
+                        help='Завершиться с кодом 1, если доля ошибок (0..1) больше указанной')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Выводить логи долбилки, в том числе о каждом неудачном запросе')
+    return parser.parse_args(args)
+
+
+def main(args: Optional[list[str]] = None) -> int:
+    """
+    Точка входа нагрузочного теста
+    """
+    options: argparse.Namespace = parse_args(args)
+    # Без -v долбилка не пишет в лог о каждом неудачном запросе: ошибки подсчитываются в отчёте
+    logging.basicConfig(level=logging.INFO if options.verbose else logging.CRITICAL,
+                        format='[%(asctime)s][%(levelname)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+
+    pinger = Pinger(max_concurrency=options.concurrency, pool_size=options.pool_size,
+                    connect_timeout=options.connect_timeout, read_timeout=options.read_timeout,
+                    retries=options.retries, check_in_processes=options.check_in_processes,
+                    check_timeout=options.check_timeout)
+    stats = LoadStats()
+    pinger.on_response = stats.on_response
+    traffic_lights_data: list[TrafficLightData] = create_traffic_lights_data(load_city(options.city))
+    for data in traffic_lights_data:
+        pinger.add_traffic_light(data)
+    pinger.running = True
+
+    mock_services: list[subprocess.Popen] = []
+    if options.mock:
+        mock_services = start_mock_services(traffic_lights_data, options.mock_latency, options.mock_error_rate)
+    try:
+        duration: float = run(pinger, stats, options.rate, options.duration)
+    finally:
+        pinger.close()
+        stop_mock_services(mock_services)
+
+    print(stats.report(len(pinger.registry), duration))
+    if options.max_error_rate is not None and stats.get_error_rate() > options.max_error_rate:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
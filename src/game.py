@@ -11,13 +11,13 @@
 Основные функции:
 - Запуск и остановка игры
 - Обработка ввода (клавиатура, мышь)
-- Обновление и отрисовка текущего состояния
+- Обновление и отрисовка текущего состояния (перерисовываются только изменившиеся области экрана)
 - Управление временем кадров (delta time)
 - Взаимодействие с сервером светофоров через Pinger
 """
 import os
 import logging
-from typing import Any, TypeVar, Type, Optional
+from typing import TYPE_CHECKING, Any, TypeVar, Type, Optional
 
 from colorlog import ColoredFormatter
 
@@ -26,7 +26,8 @@ from pygame import Surface
 from pygame.time import Clock
 
 from src.state import State
-from src.pinger import Pinger
+from src.pinger import Pinger, PingScheduler
+from src.sprites import NoteIcon
 
 # - - - - - Импорты НЕ УДАЛЯТЬ. Нужен чтобы все дочерние классы State были инициализированны
 from src.states import *  # pylint: disable=wildcard-import
@@ -34,6 +35,9 @@ from check import master
 
 # - - - - -
 
+if TYPE_CHECKING:
+    from src.sprite import Sprite
+
 StateT = TypeVar('StateT', bound=State)
 
 
@@ -62,7 +66,8 @@ class Game:
         _previous_mouse_location (tuple[int, int]): Предыдущая позиция мыши
         mouse_offset (tuple[int, int]): Смещение мыши с последнего кадра
         pinger (Pinger): Клиент для взаимодействия с сервером светофоров
-        last_ping_time (float): Время последнего ping-запроса
+        _composed (dict[Sprite, tuple[Surface, Rect]]): Изображения и области спрайтов на экране с прошлого кадра
+        ping_scheduler (PingScheduler): Фоновый поток, пингующий светофоры раз в секунду
     """
 
     def __init__(self):
@@ -76,6 +81,9 @@ class Game:
 
         self.screen: Surface = pg.display.set_mode((1920, 1080))
         self.clock: Clock = Clock()
+        self._composed: dict['Sprite', tuple[Surface, pg.Rect]] = {}
+        self._composed_state: Optional['State'] = None
+        self._composed_size: tuple[int, int] = (0, 0)
 
         self.omitted_buttons: list[int] = []
         self.omitted_mouse_buttons: list[int] = []
@@ -89,10 +97,13 @@ class Game:
         self.mouse_offset: tuple[int, int] = (0, 0)
 
         self.pinger: Pinger = Pinger()
-        self.last_ping_time: float = 0
+        self.ping_scheduler: PingScheduler = PingScheduler(self.pinger)
+        self.ping_scheduler.start()
 
         pg.display.set_caption('Город светофоров')
 
+        NoteIcon.preload()
+
         self.init_states()
 
     def loop(self):
@@ -134,6 +145,8 @@ class Game:
 
             self.update()
 
+        self.ping_scheduler.stop()
+        self.pinger.close()
         pg.quit()
 
     def update(self):
@@ -152,15 +165,75 @@ class Game:
         self.update_view()
 
     def update_view(self):
-        """Отрисовывает все объекты на сцене.
+        """Отрисовывает изменившиеся области сцены.
+
+        Перерисовываются только области спрайтов, которые изменились, сдвинулись, появились
+        или исчезли с прошлого кадра, и только они передаются в pg.display.update().
+        Если на экране ничего не изменилось, кадр не отрисовывается.
+
+        Note:
+            При смене сцены, изменении размера окна или если изменилась большая часть экрана,
+            экран перерисовывается целиком.
         """
-        x_factor = pg.display.get_window_size()[0] / 1920
-        y_factor = pg.display.get_window_size()[1] / 1080
-        self.screen.fill((32, 32, 32))
+        window_size: tuple[int, int] = pg.display.get_window_size()
+        x_factor = window_size[0] / 1920
+        y_factor = window_size[1] / 1080
+
+        composed: dict['Sprite', tuple[Surface, pg.Rect]] = {}
+        dirty_rects: list[pg.Rect] = []
         for sprite in self.current_state.sprites.values():
-            self.screen.blit(sprite.image,
-                             pg.Rect(sprite.rect.x * x_factor, sprite.rect.y * y_factor, 0, 0))
-        pg.display.flip()
+            rect = pg.Rect(sprite.rect.x * x_factor, sprite.rect.y * y_factor, *sprite.image.get_size())
+            whole, rects = sprite.pop_dirty_rects()
+            previous: Optional[tuple[Surface, pg.Rect]] = self._composed.get(sprite)
+            if previous is None or whole or previous[0] is not sprite.image or previous[1] != rect:
+                dirty_rects.append(rect)
+                if previous is not None and previous[1] != rect:
+                    dirty_rects.append(previous[1])
+            else:
+                dirty_rects.extend(dirty_rect.move(rect.topleft) for dirty_rect in rects)
+            composed[sprite] = (sprite.image, rect)
+        for sprite, (_, rect) in self._composed.items():
+            if sprite not in composed:
+                dirty_rects.append(rect)
+
+        screen_rect: pg.Rect = self.screen.get_rect()
+        dirty_rects = self._merge_rects([rect.clip(screen_rect) for rect in dirty_rects])
+        redraw_all: bool = (self._composed_state is not self.current_state or self._composed_size != window_size or
+                            sum(rect.w * rect.h for rect in dirty_rects) * 2 > screen_rect.w * screen_rect.h)
+        self._composed = composed
+        self._composed_state = self.current_state
+        self._composed_size = window_size
+
+        if redraw_all:
+            self.screen.fill((32, 32, 32))
+            self.screen.blits([(image, rect) for image, rect in composed.values()], doreturn=False)
+            pg.display.flip()
+            return
+        if not dirty_rects:
+            return
+
+        for dirty_rect in dirty_rects:
+            self.screen.set_clip(dirty_rect)
+            self.screen.fill((32, 32, 32), dirty_rect)
+            self.screen.blits([(image, rect) for image, rect in composed.values() if rect.colliderect(dirty_rect)],
+                              doreturn=False)
+        self.screen.set_clip(None)
+        pg.display.update(dirty_rects)
+
+    @staticmethod
+    def _merge_rects(rects: list[pg.Rect]) -> list[pg.Rect]:
+        """Объединение пересекающихся областей, чтобы не перерисовывать их дважды.
+        """
+        merged: list[pg.Rect] = []
+        for rect in rects:
+            if rect.w <= 0 or rect.h <= 0:
+                continue
+            index: int = rect.collidelist(merged)
+            while index != -1:
+                rect = rect.union(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
 
     def init_states(self):
         """Инициализировать сцены по умолчанию.
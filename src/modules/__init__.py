@@ -1,2 +1,12 @@
+from .tile_texture import TileTexture
+from .tile_grid import TileGrid
 from .map_generator import MapGenerator
-from .traffic_light_data import TrafficLightData, TrafficLightSegment
+from .map_cache import MapCache
+from .infinite_map import InfiniteMap
+from .map_loader import MapLoader
+from .traffic_light_state_store import TrafficLightStateStore, TrafficLightSlot
+from .traffic_light_data import TrafficLightData, Note, NoteType
+from .traffic_light_types import TrafficLightSegment, TrafficLightType, TrafficLightTypeRegistry
+from .traffic_light_registry import TrafficLightRegistry
+from .texture_registry import TextureRegistry
+from .visible_tiles import VisibleTiles
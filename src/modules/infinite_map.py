@@ -0,0 +1,212 @@
+"""Модуль бесконечной карты города.
+
+Карта делится на квадратные куски, каждый из которых генерируется MapGenerator отдельно
+по seed, полученному из seed города и координат куска. Куски создаются по мере приближения
+камеры и выгружаются из памяти, когда камера уходит далеко, поэтому в памяти находится
+только окрестность камеры.
+
+Чтобы дороги соседних кусков были связаны, через середину каждого куска проходят две
+магистрали на всю его ширину и высоту. Они совпадают с магистралями соседних кусков
+и проходят через точку, с которой MapGenerator начинает строительство дорог куска.
+"""
+import logging
+import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from math import inf
+from typing import Iterator, Mapping, Optional
+
+import numpy as np
+
+from src.modules.map_generator import MapGenerator
+from src.modules.tile_texture import TileTexture
+
+
+class InfiniteMap(Mapping[tuple[int, int], TileTexture]):
+    """Бесконечная карта, которая ведёт себя как словарь {(x, y): TileTexture}.
+
+    Любой тайл считается частью карты. Перебор и len() учитывают только загруженные куски.
+
+    Куски генерируются только в фоновом потоке. Пока кусок не готов, map[pos] возвращает
+    placeholder и отправляет кусок на генерацию, поэтому чтение карты при отрисовке не ждёт генератор.
+    Если нужен настоящий тайл, используется get_tile(), который дожидается генерации куска.
+
+    Attributes:
+        seed: Seed города
+        chunk_size: Размер куска в тайлах
+        max_chunks: Сколько кусков хранить в памяти одновременно
+        revision: Номер изменения карты, увеличивается при появлении каждого нового куска
+    """
+    placeholder: TileTexture = TileTexture.GRASS
+    _textures: tuple[TileTexture, ...] = tuple(sorted(TileTexture, key=lambda texture: texture.value))
+
+    def __init__(self, seed: int, chunk_size: int = 64, max_chunks: int = 256):
+        self.seed: int = seed
+        self.chunk_size: int = chunk_size
+        self.max_chunks: int = max_chunks
+        self.revision: int = 0
+        self._chunks: OrderedDict[tuple[int, int], np.ndarray] = OrderedDict()
+        self._pending: dict[tuple[int, int], Future] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def get_chunk(self, chunk: tuple[int, int]) -> Optional[np.ndarray]:
+        """Получение готового куска карты. Если кусок ещё не готов, он отправляется на генерацию.
+
+        Args:
+            chunk: Координаты куска
+
+        Returns:
+            Optional[np.ndarray]: Кусок или None, если он ещё генерируется.
+        """
+        with self._lock:
+            grid: Optional[np.ndarray] = self._chunks.get(chunk)
+            if grid is not None:
+                self._chunks.move_to_end(chunk)
+                return grid
+            self._request(chunk)
+        return None
+
+    def load_chunk(self, chunk: tuple[int, int]) -> np.ndarray:
+        """Получение куска карты с ожиданием его генерации в фоновом потоке.
+
+        Args:
+            chunk: Координаты куска
+        """
+        with self._lock:
+            grid: Optional[np.ndarray] = self._chunks.get(chunk)
+            if grid is not None:
+                self._chunks.move_to_end(chunk)
+                return grid
+            future: Future = self._request(chunk)
+        return future.result()
+
+    def get_tile(self, pos: tuple[int, int]) -> TileTexture:
+        """Получение тайла с ожиданием генерации его куска, в отличие от map[pos].
+        """
+        cx, x = divmod(pos[0], self.chunk_size)
+        cy, y = divmod(pos[1], self.chunk_size)
+        return InfiniteMap._textures[self.load_chunk((cx, cy))[x, y]]
+
+    def is_area_ready(self, first: tuple[int, int], last: tuple[int, int]) -> bool:
+        """Готовы ли все куски, покрывающие прямоугольник тайлов. Неготовые куски отправляются на генерацию.
+
+        Args:
+            first: Тайл с наименьшими координатами
+            last: Тайл с наибольшими координатами
+        """
+        first_chunk: tuple[int, int] = self.get_chunk_position(first)
+        last_chunk: tuple[int, int] = self.get_chunk_position(last)
+        ready: bool = True
+        with self._lock:
+            for cx in range(first_chunk[0], last_chunk[0] + 1):
+                for cy in range(first_chunk[1], last_chunk[1] + 1):
+                    if (cx, cy) not in self._chunks:
+                        self._request((cx, cy))
+                        ready = False
+        return ready
+
+    def prefetch(self, pos: tuple[int, int], radius: int):
+        """Фоновая генерация кусков вокруг тайла и выгрузка дальних кусков.
+
+        Args:
+            pos: Тайл, вокруг которого нужны куски (обычно тайл в центре экрана)
+            radius: Сколько кусков вокруг нужно подготовить
+        """
+        center: tuple[int, int] = self.get_chunk_position(pos)
+        missing: list[tuple[int, int]] = []
+        with self._lock:
+            for cx in range(center[0] - radius, center[0] + radius + 1):
+                for cy in range(center[1] - radius, center[1] + radius + 1):
+                    if (cx, cy) not in self._chunks and (cx, cy) not in self._pending:
+                        missing.append((cx, cy))
+            self._evict(center, radius + 2)
+            missing.sort(key=lambda chunk: max(abs(chunk[0] - center[0]), abs(chunk[1] - center[1])))
+            for chunk in missing:
+                self._request(chunk)
+
+    def get_chunk_position(self, pos: tuple[int, int]) -> tuple[int, int]:
+        return pos[0] // self.chunk_size, pos[1] // self.chunk_size
+
+    def get_loaded_chunks(self) -> list[tuple[int, int]]:
+        with self._lock:
+            return list(self._chunks.keys())
+
+    def close(self):
+        """Остановка фоновой генерации.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._pending.clear()
+
+    def _request(self, chunk: tuple[int, int]) -> Future:
+        """Отправка куска на генерацию, если он ещё не генерируется. Вызывается под self._lock.
+        """
+        future: Optional[Future] = self._pending.get(chunk)
+        if future is None:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='infinite-map')
+            future = self._executor.submit(self._prefetch_chunk, chunk)
+            self._pending[chunk] = future
+        return future
+
+    def _prefetch_chunk(self, chunk: tuple[int, int]) -> np.ndarray:
+        try:
+            grid: np.ndarray = self._generate_chunk(chunk)
+        except Exception:
+            logging.exception('Ошибка генерации куска карты %s', chunk)
+            with self._lock:
+                self._pending.pop(chunk, None)
+            raise
+        with self._lock:
+            self._pending.pop(chunk, None)
+            self._put_chunk(chunk, grid)
+            self.revision += 1
+        return grid
+
+    def _generate_chunk(self, chunk: tuple[int, int]) -> np.ndarray:
+        grid: np.ndarray = MapGenerator((self.chunk_size, self.chunk_size),
+                                        self._get_chunk_seed(chunk)).generate_map().grid
+        middle: int = self.chunk_size // 2
+        grid[:, middle] = TileTexture.ASPHALT.value
+        grid[middle, :] = TileTexture.ASPHALT.value
+        grid.flags.writeable = False
+        return grid
+
+    def _get_chunk_seed(self, chunk: tuple[int, int]) -> int:
+        return random.Random(f'{self.seed}:{chunk[0]}:{chunk[1]}').getrandbits(63)
+
+    def _put_chunk(self, chunk: tuple[int, int], grid: np.ndarray):
+        self._chunks[chunk] = grid
+        self._chunks.move_to_end(chunk)
+        while len(self._chunks) > self.max_chunks:
+            self._chunks.popitem(last=False)
+
+    def _evict(self, center: tuple[int, int], radius: float = inf):
+        far: list[tuple[int, int]] = [chunk for chunk in self._chunks
+                                      if max(abs(chunk[0] - center[0]), abs(chunk[1] - center[1])) > radius]
+        for chunk in far:
+            del self._chunks[chunk]
+
+    def __getitem__(self, pos: tuple[int, int]) -> TileTexture:
+        cx, x = divmod(pos[0], self.chunk_size)
+        cy, y = divmod(pos[1], self.chunk_size)
+        grid: Optional[np.ndarray] = self.get_chunk((cx, cy))
+        if grid is None:
+            return InfiniteMap.placeholder
+        return InfiniteMap._textures[grid[x, y]]
+
+    def __contains__(self, pos: object) -> bool:
+        return isinstance(pos, tuple) and len(pos) == 2 and isinstance(pos[0], int) and isinstance(pos[1], int)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        for cx, cy in self.get_loaded_chunks():
+            for x in range(self.chunk_size):
+                for y in range(self.chunk_size):
+                    yield cx * self.chunk_size + x, cy * self.chunk_size + y
+
+    def __len__(self) -> int:
+        return len(self.get_loaded_chunks()) * self.chunk_size ** 2
@@ -0,0 +1,97 @@
+"""Модуль дискового кэша сгенерированных карт.
+
+Сохранённый город хранит только seed и размер карты, поэтому без кэша карта генерируется
+при каждом открытии города. Сгенерированные карты сохраняются в saves/cache/maps в формате .npy
+и при следующем открытии отображаются в память без повторной генерации.
+"""
+import logging
+import os
+import threading
+from os import path
+from typing import Optional
+
+import numpy as np
+
+from src.modules.map_generator import MapGenerator
+from src.modules.tile_grid import TileGrid
+
+
+class MapCache:
+    """Кэш сгенерированных карт по ключу (версия генератора, seed, размер).
+
+    Note:
+        Карты без seed не кэшируются, так как их нельзя сгенерировать повторно.
+    """
+    directory: str = path.join('saves', 'cache', 'maps')
+
+    @classmethod
+    def load_or_generate(cls, size: tuple[int, int], seed: int | None) -> TileGrid:
+        """Получение карты из кэша или её генерация с сохранением в кэш.
+
+        Args:
+            size: Размер карты.
+            seed: Seed карты.
+        """
+        field: Optional[TileGrid] = cls.get(size, seed)
+        if field is not None:
+            return field
+
+        field = MapGenerator(size, seed).generate_map()
+        cls.put(size, seed, field)
+        return field
+
+    @classmethod
+    def get(cls, size: tuple[int, int], seed: int | None) -> Optional[TileGrid]:
+        """Получение карты из кэша.
+
+        Returns:
+            Optional[TileGrid]: Карта, отображённая в память только для чтения, или None, если её нет в кэше.
+        """
+        if seed is None:
+            return None
+        way: str = cls.get_path(size, seed)
+        if not path.isfile(way):
+            return None
+
+        try:
+            grid: np.ndarray = np.load(way, mmap_mode='r', allow_pickle=False)
+        except (OSError, ValueError) as e:
+            logging.warning('Не удалось прочитать карту из кэша "%s": %s', way, e)
+            return None
+        if grid.dtype != np.uint8 or grid.shape != (size[0], size[1]):
+            logging.warning('Карта в кэше "%s" повреждена', way)
+            return None
+        logging.debug('Карта %s (seed: %s) загружена из кэша', size, seed)
+        return TileGrid(grid)
+
+    @classmethod
+    def put(cls, size: tuple[int, int], seed: int | None, field: TileGrid):
+        """Сохранение карты в кэш.
+        """
+        if seed is None:
+            return
+        way: str = cls.get_path(size, seed)
+        temporary: str = f'{way}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(cls.directory, exist_ok=True)
+            with open(temporary, 'wb') as file:
+                np.save(file, np.ascontiguousarray(field.grid, dtype=np.uint8), allow_pickle=False)
+            os.replace(temporary, way)
+        except OSError as e:
+            logging.warning('Не удалось сохранить карту в кэш "%s": %s', way, e)
+            if path.exists(temporary):
+                os.remove(temporary)
+
+    @classmethod
+    def get_path(cls, size: tuple[int, int], seed: int) -> str:
+        return path.join(cls.directory, f'v{MapGenerator.version}_{seed}_{size[0]}x{size[1]}.npy')
+
+    @classmethod
+    def clear(cls):
+        """Удаление всех карт из кэша.
+        """
+        if not path.isdir(cls.directory):
+            return
+        for file in os.listdir(cls.directory):
+            if file.endswith('.npy'):
+                os.remove(path.join(cls.directory, file))
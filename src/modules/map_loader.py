@@ -0,0 +1,70 @@
+"""Модуль фоновой генерации карты.
+
+Генерация большой карты занимает заметное время, поэтому она выполняется в отдельном
+потоке, а сцена в это время продолжает отрисовывать кадры и проверять готовность карты.
+Если карта уже есть в MapCache, она берётся оттуда без генерации.
+Если размер карты не указан, создаётся InfiniteMap, куски которой генерируются по мере движения камеры.
+"""
+import logging
+import threading
+from typing import Mapping, Optional
+
+from src.modules.infinite_map import InfiniteMap
+from src.modules.map_cache import MapCache
+from src.modules.tile_texture import TileTexture
+
+
+class MapLoader:
+    """Фоновый поток, генерирующий карту.
+
+    Attributes:
+        size: Размер карты. None для бесконечной карты.
+        seed: Seed карты.
+    """
+
+    def __init__(self, size: Optional[tuple[int, int]], seed: int | None):
+        self.size: Optional[tuple[int, int]] = size
+        self.seed: int | None = seed
+        self._result: Optional[Mapping[tuple[int, int], TileTexture]] = None
+        self._error: Optional[Exception] = None
+        self._done: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Запуск генерации карты.
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='map-loader', daemon=True)
+        self._thread.start()
+
+    def is_done(self) -> bool:
+        return self._done.is_set()
+
+    def get_result(self, timeout: Optional[float] = None) -> Mapping[tuple[int, int], TileTexture]:
+        """Получение сгенерированной карты.
+
+        Args:
+            timeout: Сколько секунд ждать окончания генерации. Если не указано, ждать до конца.
+
+        Raises:
+            TimeoutError: Карта не успела сгенерироваться.
+            Exception: Ошибка, возникшая при генерации карты.
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError('Карта ещё не сгенерирована')
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def _run(self):
+        try:
+            if self.size is None:
+                self._result = InfiniteMap(self.seed if self.seed is not None else 0)
+            else:
+                self._result = MapCache.load_or_generate(self.size, self.seed)
+        except Exception as e:
+            logging.exception('Ошибка генерации карты %s (seed: %s)', self.size, self.seed)
+            self._error = e
+        finally:
+            self._done.set()
@@ -0,0 +1,69 @@
+"""Модуль общего для всего процесса хранилища текстур секций светофоров.
+
+Каждый файл текстуры из saves/traffic_lights/textures читается один раз и хранится
+в неизменяемом виде: вариации текстуры — в MappingProxyType, пиксельарт — в
+кортежах, а одинаковые цвета разделяют один и тот же объект кортежа.
+"""
+import json
+import threading
+from os import path
+from types import MappingProxyType
+from typing import Mapping
+
+PixelartData = tuple[tuple[tuple[int, int, int, int], ...], ...]
+
+
+class TextureRegistry:
+    """Хранилище загруженных текстур.
+
+    Note:
+        После перезаписи файла текстуры нужно вызвать invalidate(), иначе будет
+        возвращаться старая версия.
+    """
+    _textures: dict[str, Mapping[str, PixelartData]] = {}
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def get(cls, texture: str) -> Mapping[str, PixelartData]:
+        """Получение текстуры.
+
+        Args:
+            texture: Название текстуры (имя файла без расширения).
+
+        Returns:
+            Mapping[str, PixelartData]: Вариации текстуры, где ключ - значение секции, например "on".
+        """
+        loaded: Mapping[str, PixelartData] | None = cls._textures.get(texture)
+        if loaded is not None:
+            return loaded
+        with cls._lock:
+            if texture not in cls._textures:
+                cls._textures[texture] = cls._load(texture)
+            return cls._textures[texture]
+
+    @classmethod
+    def invalidate(cls, texture: str | None = None):
+        """Удаление текстуры из хранилища, чтобы при следующем обращении она была прочитана заново.
+
+        Args:
+            texture: Название текстуры. Если не указано, удаляются все текстуры.
+        """
+        with cls._lock:
+            if texture is None:
+                cls._textures.clear()
+            else:
+                cls._textures.pop(texture, None)
+
+    @staticmethod
+    def _load(texture: str) -> Mapping[str, PixelartData]:
+        with open(path.join('saves', 'traffic_lights', 'textures', f'{texture}.json'), 'r') as file:
+            data: dict = json.loads(file.read())
+
+        colors: dict[tuple[int, int, int, int], tuple[int, int, int, int]] = {}
+        variants: dict[str, PixelartData] = {}
+        for value, pixelart in data.items():
+            variants[value] = tuple(
+                tuple(colors.setdefault(color, color) for color in map(tuple, row))
+                for row in pixelart
+            )
+        return MappingProxyType(variants)
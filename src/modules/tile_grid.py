@@ -0,0 +1,41 @@
+from typing import Iterator, Mapping
+
+import numpy as np
+
+from src.modules.tile_texture import TileTexture
+
+
+class TileGrid(Mapping[tuple[int, int], TileTexture]):
+    """
+    Карта в виде двумерного массива uint8, где в ячейке [x, y] хранится значение TileTexture.
+    Ведёт себя как словарь {(x, y): TileTexture}, но занимает по байту на тайл.
+
+    Attributes:
+        grid: Массив размером (ширина, высота)
+    """
+    _textures: tuple[TileTexture, ...] = tuple(sorted(TileTexture, key=lambda texture: texture.value))
+
+    def __init__(self, grid: np.ndarray):
+        self.grid: np.ndarray = grid
+
+    def get_size(self) -> tuple[int, int]:
+        return self.grid.shape[0], self.grid.shape[1]
+
+    def __getitem__(self, pos: tuple[int, int]) -> TileTexture:
+        x, y = pos
+        if not (0 <= x < self.grid.shape[0] and 0 <= y < self.grid.shape[1]):
+            raise KeyError(pos)
+        return TileGrid._textures[self.grid[x, y]]
+
+    def __contains__(self, pos: object) -> bool:
+        if not isinstance(pos, tuple) or len(pos) != 2:
+            return False
+        return 0 <= pos[0] < self.grid.shape[0] and 0 <= pos[1] < self.grid.shape[1]
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        for x in range(self.grid.shape[0]):
+            for y in range(self.grid.shape[1]):
+                yield x, y
+
+    def __len__(self) -> int:
+        return self.grid.size
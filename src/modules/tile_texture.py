@@ -0,0 +1,59 @@
+from typing import Self
+from enum import Enum
+import random
+
+
+class TileTexture(Enum):
+    GRASS = 0
+    STONE = 1
+    SAND = 2
+    WATER = 3
+    ASPHALT = 4
+
+    @classmethod
+    def get_one_of_colors(cls, texture: Self, rng: random.Random | None = None) -> tuple[int, int, int]:
+        """Получение случайного цвета пикселя текстуры.
+
+        Args:
+            texture: Текстура
+            rng: Генератор случайных чисел. Если не указан, используется глобальный
+        """
+        colors: dict[Self, list[tuple[int, int, int]]] = {
+            TileTexture.GRASS: [
+                (58, 140, 62),
+                (94, 124, 22),
+                (102, 162, 24),
+                (58, 109, 53)
+            ],
+            TileTexture.STONE: [
+                (90, 90, 90),
+                (120, 120, 120),
+                (60, 60, 60),
+                (150, 150, 150)
+            ],
+            TileTexture.SAND: [
+                (180, 165, 140),
+                (160, 145, 120),
+                (140, 125, 100),
+                (120, 105, 80)
+            ],
+            TileTexture.WATER: [
+                (100, 210, 220),
+                (0, 150, 170),
+                (70, 200, 200),
+                (0, 105, 120)
+            ],
+            TileTexture.ASPHALT: [
+                (50, 50, 50),
+                (60, 55, 50),
+                (30, 30, 30),
+                (70, 65, 60)
+            ]
+        }
+        choice, randint = (rng.choice, rng.randint) if rng is not None else (random.choice, random.randint)
+        color = choice(colors[texture])
+        return (
+            min(255, max(0, color[0] + randint(-10, 10))),
+            min(255, max(0, color[1] + randint(-10, 10))),
+            min(255, max(0, color[2] + randint(-10, 10)))
+        )
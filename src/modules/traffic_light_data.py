@@ -1,16 +1,10 @@
 import logging
-from typing import Optional
+from typing import Optional, Mapping
 
 from enum import Enum
-from os import path
-from pathlib import Path
-import json
-from math import ceil
 
-import pygame as pg
-from pygame import SRCALPHA
-
-from src.sprites.pixelart import Pixelart
+from src.modules.traffic_light_state_store import TrafficLightStateStore, TrafficLightSlot
+from src.modules.traffic_light_types import TrafficLightType, TrafficLightTypeRegistry, TrafficLightSegment
 
 
 class NoteType(Enum):
@@ -23,9 +17,29 @@ class NoteType(Enum):
 
 
 class Note:
-    def __init__(self):
-        self._level: Optional[NoteType] = NoteType.WAIT_MARK
-        self.note: Optional[str] = None
+    """Записка светофора.
+
+    Уровень и текст записки хранятся в слоте светофора в TrafficLightStateStore. Записка держит
+    слот, поэтому остаётся записка того же светофора, даже если пережила его объект.
+    """
+    __slots__ = ('_owner', '_store', '_slot')
+    _levels: tuple[NoteType, ...] = tuple(sorted(NoteType, key=lambda level: level.value))
+
+    def __init__(self, slot: TrafficLightSlot):
+        self._owner: TrafficLightSlot = slot
+        self._store: TrafficLightStateStore = slot.store
+        self._slot: int = slot.index
+
+    @property
+    def note(self) -> Optional[str]:
+        return self._store.notes.get(self._slot)
+
+    @note.setter
+    def note(self, note: Optional[str]):
+        if note is None:
+            self._store.notes.pop(self._slot, None)
+        else:
+            self._store.notes[self._slot] = note
 
     def set_level(self, level: Optional[NoteType | int]):
         """Установить или удалить записку для светофора.
@@ -42,131 +56,121 @@ class Note:
             - QUESTION_ERROR (3): Ошибка невозможности проверки светофора на работоспособность.
         """
         if type(level) == NoteType:
-            self._level = level
+            self._store.note_level[self._slot] = level.value
         elif type(level) == int:
-            self._level = NoteType(level)
+            self._store.note_level[self._slot] = NoteType(level).value
         elif level is None:
-            self._level = None
+            self._store.note_level[self._slot] = TrafficLightStateStore.NO_NOTE
         else:
             logging.warning('Невозможно установить уровень записки: "%s"', level)
 
     def get_level(self) -> Optional[NoteType]:
-        return self._level
-
-    def get_cover(self, size: tuple[int, int]) -> pg.Surface:
-        return self.get_cover_by_level(size, self.get_level())
-
-    @staticmethod
-    def get_cover_by_level(size: tuple[int, int], icon_level: Optional[int]) -> pg.Surface:
-        """Получение иконки записки.
-
-        Args:
-            size: Размер иконки в пикселях
-            icon_level: Уровень записки для светофора
-        """
-        if icon_level is None:
-            return pg.Surface((0, 0))
-        paths: dict[NoteType, str] = {
-            NoteType.EXCLAMATION_ERROR: path.join('assets', 'images', 'exclamation_error.png'),
-            NoteType.WAIT_MARK: path.join('assets', 'images', 'wait_mark.png'),
-            NoteType.CLOUD_ERROR: path.join('assets', 'images', 'cloud_error.png'),
-            NoteType.QUESTION_ERROR: path.join('assets', 'images', 'question_error.png'),
-            NoteType.QUESTION_WARNING: path.join('assets', 'images', 'question_warning.png'),
-            NoteType.OK: path.join('assets', 'images', 'ok_mark.png'),
-        }
-
-        pixel_size: tuple[float, float] = (size[0] / 16, size[1] / 16)
-
-        surface: pg.Surface = pg.Surface(size, SRCALPHA, 32).convert_alpha()
-
-        pixelart = Pixelart.get_pixelart_by_image(paths[NoteType(icon_level)])
-        for y in range(len(pixelart)):
-            for x in range(len(pixelart[y])):
-                pg.draw.rect(surface, pixelart[y][x], pg.Rect(
-                    pixel_size[0] * x, pixel_size[1] * y, ceil(pixel_size[0]), ceil(pixel_size[1])
-                ))
+        level: int = self._store.note_level[self._slot]
+        return None if level == TrafficLightStateStore.NO_NOTE else Note._levels[level]
 
-        return surface
 
-
-class TrafficLightSegment:
-    """
-    Информация о сегменте светофора, также получение изображения секции из текстуры
+class TrafficLightData:
     """
+    Информация о светофоре, основываясь на его типе.
 
-    def __init__(self, pos: tuple[int, int], texture: str, value: str | None = None):
-        self.pos: tuple[int, int] = pos
-        self.texture: str = texture
-        self.value: str = self._get_values()[0] if value is None else value
-
-    def get_pixelart_by_value(self, value: str) -> tuple[tuple[tuple[int, int, int, int], ...]]:
-        return self._get_texture()[value]
+    Описание типа (url, секции, состояния) общее для всех светофоров этого типа и берётся
+    из TrafficLightTypeRegistry. Изменяемое состояние светофора хранится в слоте TrafficLightStateStore,
+    который освобождается вместе с объектом и его запиской.
+    """
+    __slots__ = ('uuid', 'tfl_type', 'definition', 'store', 'slot', 'note', '_owner')
+    default_store: TrafficLightStateStore = TrafficLightStateStore()
 
-    def get_image_by_value(self, value: str, size: int) -> pg.Surface:
-        """
-        Гарантируется, что изображение будет квадратным
+    def __init__(self, tfl_type: str, uuid: str | None, store: Optional[TrafficLightStateStore] = None):
+        self.uuid: str | None = uuid
+        self.tfl_type: str = tfl_type
+        self.definition: TrafficLightType = TrafficLightTypeRegistry.get(tfl_type)
+        self.store: TrafficLightStateStore = store if store is not None else TrafficLightData.default_store
+        self._owner: TrafficLightSlot = TrafficLightSlot(self.store, NoteType.WAIT_MARK.value)
+        self.slot: int = self._owner.index
+        self.note: Note = Note(self._owner)
+
+    @property
+    def current_time(self) -> int:
+        return self.store.current_time[self.slot]
+
+    @current_time.setter
+    def current_time(self, current_time: int):
+        self.store.current_time[self.slot] = current_time
+
+    @property
+    def status(self) -> int:
+        """Статус код последнего ответа сервиса. -1, если ответа не было, 0, если светофор ещё не опрашивался.
         """
-        image: pg.Surface = pg.Surface((size, size), SRCALPHA, 32).convert_alpha()
-        pixel_size: float = size / 16
+        return self.store.status[self.slot]
 
-        pixelart: tuple[tuple[tuple[int, int, int, int], ...]] = self.get_pixelart_by_value(value)
-        for row in range(len(pixelart)):
-            for pixel in range(len(pixelart)):
-                pg.draw.rect(image, pixelart[row][pixel], pg.Rect(
-                    pixel * pixel_size, row * pixel_size, ceil(pixel_size), ceil(pixel_size)
-                ))
+    @status.setter
+    def status(self, status: int):
+        self.store.status[self.slot] = status
 
-        return image
+    @property
+    def url(self) -> str:
+        return self.definition.url
 
-    def _get_values(self) -> list[str]:
-        """
-        Получение всех возможных вариаций текстуры светофора
-        """
-        return list(self._get_texture().keys())
+    @property
+    def type_use(self) -> bool:
+        return self.definition.type_use
 
-    def _get_texture(self) -> dict:
-        data: dict = {}
-        with open(path.join('saves', 'traffic_lights', 'textures', f'{self.texture}.json')) as file:
-            data = json.loads(file.read())
-        return data
+    @property
+    def type_value(self) -> str:
+        return self.definition.type_value
 
-    def __str__(self):
-        return f'"pos": {self.pos}, "texture": {self.texture}, "value": {self.value}"'
+    @property
+    def batch(self) -> bool:
+        return self.definition.batch
 
-    def __repr__(self):
-        return self.__str__()
+    @property
+    def segments(self) -> Mapping[str, TrafficLightSegment]:
+        return self.definition.segments
 
+    @property
+    def states(self) -> tuple[Mapping[str, str], ...]:
+        return self.definition.states
 
-class TrafficLightData:
-    """
-    Информация о светофоре, основываясь на его типе
-    """
+    def get_state(self) -> int:
+        return self.store.state[self.slot]
 
-    def __init__(self, tfl_type: str, uuid: str | None):
-        self.uuid: str | None = uuid
-        self.tfl_type: str = tfl_type
+    def set_state(self, state: int):
+        if not 0 <= state < len(self.definition.states):
+            raise IndexError(f'У светофора типа {self.tfl_type} нет состояния {state + 1}')
+        if state != self.store.state[self.slot]:
+            self.store.current_time[self.slot] = 1
+            self.store.state[self.slot] = state
 
-        data: dict = self._get_traffic_light_data()
+    def advance(self, state: int):
+        """Переход в состояние, полученное от сервиса, за одно обращение к хранилищу.
 
-        self.url: str = data['url']
-        self.type_use: bool = self._get_type_use(data)
-        self.type_value: str = self._get_type_value(data)
-        self.segments: dict[str, TrafficLightSegment] = self._get_segments(data)
-        self.states: list[dict[str, str]] = self._get_states(data)
-        self.current_time: int = 1
-        self.note: Note = Note()
-        self._state: int = 0
+        Если состояние не изменилось, время в нём увеличивается, иначе отсчёт начинается заново.
+        Записка светофора снимается.
 
-        self._update_segments()
+        Args:
+            state: Номер нового состояния.
 
-    def get_state(self) -> int:
-        return self._state
+        Raises:
+            IndexError: У светофора нет такого состояния.
+        """
+        if not 0 <= state < len(self.definition.states):
+            raise IndexError(f'У светофора типа {self.tfl_type} нет состояния {state + 1}')
+        store: TrafficLightStateStore = self.store
+        slot: int = self.slot
+        if state == store.state[slot]:
+            store.current_time[slot] += 1
+        else:
+            store.state[slot] = state
+            store.current_time[slot] = 1
+        store.note_level[slot] = TrafficLightStateStore.NO_NOTE
 
-    def set_state(self, state: int):
-        if state != self._state:
-            self.current_time = 1
-        self._state = state
-        self._update_segments()
+    def get_segment_value(self, name: str) -> str:
+        """Получение значения секции в текущем состоянии светофора.
+
+        Args:
+            name: Название секции.
+        """
+        return self.definition.states[self.store.state[self.slot]][name]
 
     @staticmethod
     def get_all_types() -> list[str]:
@@ -175,57 +179,18 @@ class TrafficLightData:
         Returns:
             list[str]: Список светофоров.
         """
-        return [way.stem for way in Path(path.join('saves', 'traffic_lights')).glob('*.json')]
-
-    def _update_segments(self):
-        for name, segment in self.segments.items():
-            segment.value = self.states[self._state][name]
-
-    def _get_traffic_light_data(self) -> dict:
-        with open(path.join('saves', 'traffic_lights', f'{self.tfl_type}.json'), 'r') as file:
-            return json.loads(file.read())
-
-    @staticmethod
-    def _get_url(data: dict) -> str:
-        return str(data['url'])
-
-    @staticmethod
-    def _get_type_use(data: dict) -> bool:
-        return bool(data['type']['use'])
-
-    @staticmethod
-    def _get_type_value(data: dict) -> str:
-        return str(data['type']['value'])
-
-    @staticmethod
-    def _get_segments(data: dict) -> dict[str, TrafficLightSegment]:
-        segments: dict[str, TrafficLightSegment] = {}
-        for name, segment in data['segments'].items():
-            segments[name] = TrafficLightSegment(
-                (int(segment['pos']['x']), int(segment['pos']['y'])),
-                str(segment['texture'])
-            )
-        return segments
-
-    @staticmethod
-    def _get_states(data: dict) -> list[dict[str, str]]:
-        states: list[dict[str, str]] = []
-        for state in data['states']:
-            states.append(state)
-        return states
+        return TrafficLightTypeRegistry.get_all_types()
 
     def get_size(self) -> tuple[int, int]:
         """
         Получение размера светофора, где размер одной секции 1x1
         """
-        size: tuple[int, int] = (1, 1)
-        for segment in self.segments.values():
-            size = (max(size[0], segment.pos[0] + 1), max(size[1], segment.pos[1] + 1))
-        return size
+        return self.definition.size
 
     def __str__(self):
         return (f'"url": {self.url}, '
                 f'"use": {self.type_use}, '
                 f'"value": {self.type_value}, '
-                f'"segments": {self.segments},'
-                f'"states": {self.states}')
+                f'"batch": {self.batch}, '
+                f'"segments": {dict(self.segments)},'
+                f'"states": {[dict(state) for state in self.states]}')
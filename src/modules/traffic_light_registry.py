@@ -0,0 +1,119 @@
+"""Модуль реестра светофоров города.
+
+Реестр хранит данные всех построенных светофоров и индексирует их по uuid, позиции тайла и типу,
+поэтому постройка, удаление и поиск светофора выполняются за O(1) при любом количестве светофоров.
+Один реестр используется долбилкой (Pinger) и полем (Field).
+"""
+import threading
+from typing import Iterator, Optional
+
+from src.modules.traffic_light_data import TrafficLightData
+
+
+class TrafficLightRegistry:
+    """Реестр светофоров с индексами по uuid, позиции и типу.
+
+    Note:
+        Долбилка читает реестр из фонового потока, поэтому изменения защищены блокировкой,
+        а get_all() возвращает снимок, который не меняется при постройке и удалении светофоров.
+    """
+
+    def __init__(self):
+        self._by_uuid: dict[str | None, TrafficLightData] = {}
+        self._pos_by_uuid: dict[str | None, tuple[int, int]] = {}
+        self._uuid_by_pos: dict[tuple[int, int], str | None] = {}
+        self._uuids_by_type: dict[str, dict[str | None, None]] = {}
+        self._snapshot: Optional[list[TrafficLightData]] = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def add(self, data: TrafficLightData, pos: Optional[tuple[int, int]] = None):
+        """Добавление светофора.
+
+        Args:
+            data: Данные светофора.
+            pos: Позиция светофора на поле. Светофоры без позиции (например, в нагрузочном тесте)
+                не попадают в индекс по позиции.
+
+        Raises:
+            ValueError: Светофор с таким uuid или на такой позиции уже существует.
+        """
+        with self._lock:
+            if data.uuid in self._by_uuid:
+                raise ValueError(f'Светофор {data.uuid} уже существует')
+            if pos is not None and pos in self._uuid_by_pos:
+                raise ValueError(f'На позиции {pos} уже стоит светофор')
+            self._by_uuid[data.uuid] = data
+            if pos is not None:
+                self._pos_by_uuid[data.uuid] = pos
+                self._uuid_by_pos[pos] = data.uuid
+            self._uuids_by_type.setdefault(data.tfl_type, {})[data.uuid] = None
+            self._snapshot = None
+
+    def remove(self, uuid: str | None) -> Optional[TrafficLightData]:
+        """Удаление светофора.
+
+        Returns:
+            Optional[TrafficLightData]: Данные удалённого светофора или None, если его не было.
+        """
+        with self._lock:
+            data: Optional[TrafficLightData] = self._by_uuid.pop(uuid, None)
+            if data is None:
+                return None
+            pos: Optional[tuple[int, int]] = self._pos_by_uuid.pop(uuid, None)
+            if pos is not None:
+                del self._uuid_by_pos[pos]
+            uuids: dict[str | None, None] = self._uuids_by_type[data.tfl_type]
+            del uuids[uuid]
+            if not uuids:
+                del self._uuids_by_type[data.tfl_type]
+            self._snapshot = None
+            return data
+
+    def clear(self):
+        with self._lock:
+            self._by_uuid = {}
+            self._pos_by_uuid = {}
+            self._uuid_by_pos = {}
+            self._uuids_by_type = {}
+            self._snapshot = None
+
+    def get(self, uuid: str | None) -> Optional[TrafficLightData]:
+        return self._by_uuid.get(uuid)
+
+    def get_pos(self, uuid: str | None) -> Optional[tuple[int, int]]:
+        return self._pos_by_uuid.get(uuid)
+
+    def get_by_pos(self, pos: tuple[int, int]) -> Optional[TrafficLightData]:
+        with self._lock:
+            uuid: str | None = self._uuid_by_pos.get(pos)
+            return self._by_uuid.get(uuid) if pos in self._uuid_by_pos else None
+
+    def get_by_type(self, tfl_type: str) -> list[TrafficLightData]:
+        """Получение всех светофоров типа в порядке постройки.
+        """
+        with self._lock:
+            return [self._by_uuid[uuid] for uuid in self._uuids_by_type.get(tfl_type, ())]
+
+    def get_all(self) -> list[TrafficLightData]:
+        """Получение всех светофоров в порядке постройки.
+
+        Returns:
+            list[TrafficLightData]: Снимок реестра. Пока реестр не меняется, возвращается один и тот же список,
+                поэтому его нельзя изменять.
+        """
+        snapshot: Optional[list[TrafficLightData]] = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = list(self._by_uuid.values())
+            return self._snapshot
+
+    def __contains__(self, uuid: object) -> bool:
+        return uuid in self._by_uuid
+
+    def __iter__(self) -> Iterator[TrafficLightData]:
+        return iter(self.get_all())
+
+    def __len__(self) -> int:
+        return len(self._by_uuid)
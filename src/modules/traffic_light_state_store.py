@@ -0,0 +1,93 @@
+"""Модуль хранилища изменяемого состояния светофоров.
+
+Состояние всех светофоров хранится по столбцам: номер состояния, время в текущем состоянии,
+уровень записки и статус последнего ответа сервиса лежат в отдельных массивах, а светофору
+выделяется строка (слот) в этих массивах. Поэтому память на светофор и стоимость обновления
+за тик не растут вместе с количеством светофоров.
+"""
+import threading
+from array import array
+from typing import Optional
+
+
+class TrafficLightStateStore:
+    """Хранилище состояния светофоров по столбцам.
+
+    Массивы расширяются на месте, поэтому запись из потока долбилки не теряется при выделении
+    новых слотов в основном потоке.
+
+    Attributes:
+        state: Номер текущего состояния светофора.
+        current_time: Сколько тиков светофор находится в текущем состоянии.
+        note_level: Уровень записки (значение NoteType) или -1, если записки нет.
+        status: Статус код последнего ответа сервиса, -1 если ответа не было, 0 если светофор ещё не опрашивался.
+        notes: Текст записок. Хранится только для слотов, у которых он есть.
+    """
+    NO_NOTE: int = -1
+
+    def __init__(self):
+        self.state: array = array('h')
+        self.current_time: array = array('q')
+        self.note_level: array = array('b')
+        self.status: array = array('h')
+        self.notes: dict[int, str] = {}
+        self._free: list[int] = []
+        self._lock: threading.Lock = threading.Lock()
+
+    def allocate(self, note_level: int) -> int:
+        """Выделение слота под новый светофор.
+
+        Args:
+            note_level: Начальный уровень записки.
+
+        Returns:
+            int: Номер слота.
+        """
+        with self._lock:
+            if self._free:
+                slot: int = self._free.pop()
+                self.state[slot] = 0
+                self.current_time[slot] = 1
+                self.note_level[slot] = note_level
+                self.status[slot] = 0
+                return slot
+            self.state.append(0)
+            self.current_time.append(1)
+            self.note_level.append(note_level)
+            self.status.append(0)
+            return len(self.state) - 1
+
+    def release(self, slot: int):
+        """Освобождение слота удалённого светофора.
+        """
+        with self._lock:
+            self.notes.pop(slot, None)
+            self._free.append(slot)
+
+    def get_capacity(self) -> int:
+        return len(self.state)
+
+    def __len__(self) -> int:
+        return len(self.state) - len(self._free)
+
+
+class TrafficLightSlot:
+    """Слот хранилища, выделенный одному светофору.
+
+    На слот ссылаются светофор и его записка. Слот освобождается, только когда удалён последний
+    из них, поэтому записка, пережившая светофор, не читает и не меняет слот нового светофора.
+
+    Attributes:
+        store: Хранилище, в котором выделен слот.
+        index: Номер слота.
+    """
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store: TrafficLightStateStore, note_level: int):
+        self.store: TrafficLightStateStore = store
+        self.index: int = store.allocate(note_level)
+
+    def __del__(self):
+        store: Optional[TrafficLightStateStore] = getattr(self, 'store', None)
+        if store is not None and hasattr(self, 'index'):
+            store.release(self.index)
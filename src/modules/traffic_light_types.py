@@ -0,0 +1,176 @@
+"""Модуль общего реестра типов светофоров.
+
+Файлы saves/traffic_lights/*.json читаются один раз, а описание каждого типа хранится
+в неизменяемом виде и разделяется всеми светофорами этого типа.
+"""
+import json
+import threading
+from os import path
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+from src.modules.texture_registry import TextureRegistry, PixelartData
+
+
+class TrafficLightSegment:
+    """
+    Информация о сегменте светофора, также получение изображения секции из текстуры
+    """
+
+    __slots__ = ('pos', 'texture')
+
+    def __init__(self, pos: tuple[int, int], texture: str):
+        self.pos: tuple[int, int] = pos
+        self.texture: str = texture
+
+    def get_pixelart_by_value(self, value: str) -> PixelartData:
+        return self._get_texture()[value]
+
+    def _get_texture(self) -> Mapping[str, PixelartData]:
+        return TextureRegistry.get(self.texture)
+
+    def __str__(self):
+        return f'"pos": {self.pos}, "texture": {self.texture}'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class TrafficLightType(NamedTuple):
+    """Неизменяемое описание типа светофора.
+
+    Attributes:
+        tfl_type: Название типа (имя файла без расширения)
+        url: Адрес сервиса
+        type_use: Передавать ли тип в запросе
+        type_value: Значение типа, передаваемое в запросе
+        batch: Опрашивать ли светофоры этого типа пакетными запросами
+        segments: Секции светофора по названию
+        states: Значения секций для каждого состояния
+        size: Размер светофора, где размер одной секции 1x1
+    """
+    tfl_type: str
+    url: str
+    type_use: bool
+    type_value: str
+    batch: bool
+    segments: Mapping[str, TrafficLightSegment]
+    states: tuple[Mapping[str, str], ...]
+    size: tuple[int, int]
+
+
+class TrafficLightTypeRegistry:
+    """Реестр типов светофоров.
+
+    Note:
+        Типы загружаются при первом обращении. Чтобы перечитать файлы с диска, вызовите reload().
+    """
+    _types: dict[str, TrafficLightType] | None = None
+    _lock: threading.RLock = threading.RLock()
+
+    @classmethod
+    def get(cls, tfl_type: str) -> TrafficLightType:
+        """Получение описания типа светофора.
+
+        Args:
+            tfl_type: Название типа.
+
+        Raises:
+            FileNotFoundError: Файла типа не существует.
+        """
+        types: dict[str, TrafficLightType] = cls._get_types()
+        if tfl_type in types:
+            return types[tfl_type]
+        with cls._lock:
+            if tfl_type not in types:
+                types[tfl_type] = cls._load(tfl_type)
+            return types[tfl_type]
+
+    @classmethod
+    def get_all_types(cls) -> list[str]:
+        """Получение всех типов светофоров.
+
+        Returns:
+            list[str]: Список светофоров.
+        """
+        return list(cls._get_types().keys())
+
+    @classmethod
+    def reload(cls):
+        """Перечитать все типы светофоров с диска.
+
+        Note:
+            Уже созданные светофоры продолжают использовать старое описание своего типа.
+        """
+        with cls._lock:
+            cls._types = None
+        cls._get_types()
+
+    @classmethod
+    def _get_types(cls) -> dict[str, TrafficLightType]:
+        types: dict[str, TrafficLightType] | None = cls._types
+        if types is not None:
+            return types
+        with cls._lock:
+            if cls._types is None:
+                cls._types = {
+                    way.stem: cls._load(way.stem)
+                    for way in sorted(Path(path.join('saves', 'traffic_lights')).glob('*.json'))
+                }
+            return cls._types
+
+    @classmethod
+    def _load(cls, tfl_type: str) -> TrafficLightType:
+        with open(path.join('saves', 'traffic_lights', f'{tfl_type}.json'), 'r') as file:
+            data: dict = json.loads(file.read())
+
+        segments: dict[str, TrafficLightSegment] = cls._get_segments(data)
+        return TrafficLightType(
+            tfl_type=tfl_type,
+            url=cls._get_url(data),
+            type_use=cls._get_type_use(data),
+            type_value=cls._get_type_value(data),
+            batch=cls._get_batch_use(data),
+            segments=MappingProxyType(segments),
+            states=cls._get_states(data),
+            size=cls._get_size(segments),
+        )
+
+    @staticmethod
+    def _get_url(data: dict) -> str:
+        return str(data['url'])
+
+    @staticmethod
+    def _get_type_use(data: dict) -> bool:
+        return bool(data['type']['use'])
+
+    @staticmethod
+    def _get_type_value(data: dict) -> str:
+        return str(data['type']['value'])
+
+    @staticmethod
+    def _get_batch_use(data: dict) -> bool:
+        return bool(data.get('batch', {}).get('use', False))
+
+    @staticmethod
+    def _get_segments(data: dict) -> dict[str, TrafficLightSegment]:
+        segments: dict[str, TrafficLightSegment] = {}
+        for name, segment in data['segments'].items():
+            segments[name] = TrafficLightSegment(
+                (int(segment['pos']['x']), int(segment['pos']['y'])),
+                str(segment['texture'])
+            )
+        return segments
+
+    @staticmethod
+    def _get_states(data: dict) -> tuple[Mapping[str, str], ...]:
+        return tuple(MappingProxyType({str(name): str(value) for name, value in state.items()})
+                     for state in data['states'])
+
+    @staticmethod
+    def _get_size(segments: dict[str, TrafficLightSegment]) -> tuple[int, int]:
+        size: tuple[int, int] = (1, 1)
+        for segment in segments.values():
+            size = (max(size[0], segment.pos[0] + 1), max(size[1], segment.pos[1] + 1))
+        return size
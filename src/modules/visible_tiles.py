@@ -0,0 +1,66 @@
+"""Модуль вычисления видимых тайлов поля.
+
+Тайл (x, y) рисуется на экране в точке (ox + hx * (x + y), oy + hy * (y - x)), где (ox, oy) - смещение
+камеры, а (hx, hy) - половина размера тайла. Поэтому условие видимости тайла сводится к двум
+ограничениям на суммы s = x + y и d = y - x, и видимые тайлы образуют ромб, который можно
+обойти по строкам без проверки каждого тайла.
+"""
+from typing import Iterator
+
+
+class VisibleTiles:
+    """Видимые тайлы в виде строк: для каждого y хранится отрезок x.
+
+    Attributes:
+        spans: Строки ромба в виде (y, первый x, последний x + 1)
+    """
+
+    __slots__ = ('spans',)
+
+    def __init__(self, spans: tuple[tuple[int, int, int], ...]):
+        self.spans: tuple[tuple[int, int, int], ...] = spans
+
+    @classmethod
+    def from_view(cls, camera_offset: tuple[int, int], half_of_tile_size: tuple[int, int],
+                  screen_size: tuple[int, int] = (1920, 1080)) -> 'VisibleTiles':
+        """Вычисление видимых тайлов.
+
+        Тайл считается видимым, если прямоугольник 2hx x 2hy, в который он вписан, пересекается с экраном.
+
+        Args:
+            camera_offset: Смещение камеры
+            half_of_tile_size: Половина размера тайла на экране
+            screen_size: Размер экрана
+        """
+        hx, hy = max(1, half_of_tile_size[0]), max(1, half_of_tile_size[1])
+        # -2h - o < s * h < w - o, то же для d
+        s_min: int = (-2 * hx - camera_offset[0]) // hx + 1
+        s_max: int = -((camera_offset[0] - screen_size[0]) // hx) - 1
+        d_min: int = (-2 * hy - camera_offset[1]) // hy + 1
+        d_max: int = -((camera_offset[1] - screen_size[1]) // hy) - 1
+
+        spans: list[tuple[int, int, int]] = []
+        for y in range(-((-s_min - d_min) // 2), (s_max + d_max) // 2 + 1):
+            start: int = max(s_min - y, y - d_max)
+            stop: int = min(s_max - y, y - d_min) + 1
+            if start < stop:
+                spans.append((y, start, stop))
+        return cls(tuple(spans))
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        for y, start, stop in self.spans:
+            for x in range(start, stop):
+                yield x, y
+
+    def __len__(self) -> int:
+        return sum(stop - start for _, start, stop in self.spans)
+
+    def __contains__(self, pos: tuple[int, int]) -> bool:
+        if not self.spans:
+            return False
+        # Ромб выпуклый, поэтому непустые строки идут подряд
+        index: int = pos[1] - self.spans[0][0]
+        if not 0 <= index < len(self.spans):
+            return False
+        _, start, stop = self.spans[index]
+        return start <= pos[0] < stop
@@ -1,2 +1,3 @@
 from .pinger import Pinger
 from .checker import Checker
+from .scheduler import PingScheduler
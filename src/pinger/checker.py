@@ -1,9 +1,23 @@
-from typing import Callable, Self
+from concurrent.futures import Executor, Future
+from functools import partial
+from typing import Callable, Optional, Self, Sequence
+
+CheckResult = tuple[bool, Optional[str]]
 
 
 class Checker:
+    """Реестр дополнительных проверок ответов сервиса по типу светофора.
+
+    Обычная проверка регистрируется через @checker('тип') и получает один запрос и ответ.
+    Пакетная проверка регистрируется через @checker.batch('тип') и за тик один раз получает списки
+    всех запросов и ответов своего типа, а возвращает результаты в том же порядке. Так проверку
+    можно написать на NumPy или другим векторным способом без вызова функции на каждый светофор.
+
+    Декораторы возвращают саму функцию, поэтому её можно вызывать и сериализовать как обычную функцию.
+    """
     _instance: Self = None
-    functions: dict[str, Callable[[dict, dict], tuple[bool, str]]] = {}
+    functions: dict[str, Callable[[dict, dict], CheckResult]] = {}
+    batch_functions: dict[str, Callable[[list[dict], list[dict]], Sequence[CheckResult]]] = {}
 
     def __init__(self):
         pass
@@ -12,21 +26,101 @@ class Checker:
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance.functions = {}
+            cls._instance.batch_functions = {}
         return cls._instance
 
-    def __call__(self, tfl_type):
-        def decorator(func):
+    def __call__(self, tfl_type: str):
+        def decorator(func: Callable[[dict, dict], CheckResult]) -> Callable[[dict, dict], CheckResult]:
             self.functions[tfl_type] = func
+            self.batch_functions.pop(tfl_type, None)
+            return func
+
+        return decorator
 
-            def wrapper(request: dict, response: dict):
-                return func(request, response)
+    def batch(self, tfl_type: str):
+        """Регистрация пакетной проверки для типа светофора.
 
-            return wrapper
+        Args:
+            tfl_type: Тип светофора.
+        """
+
+        def decorator(func: Callable[[list[dict], list[dict]], Sequence[CheckResult]]) -> \
+                Callable[[list[dict], list[dict]], Sequence[CheckResult]]:
+            self.batch_functions[tfl_type] = func
+            self.functions.pop(tfl_type, None)
+            return func
 
         return decorator
 
-    def check(self, tfl_type: str, request: dict, response: dict) -> tuple[bool, str] | None:
-        for current_type, func in self.functions.items():
-            if tfl_type == current_type:
-                return func(request, response)
+    def has_check(self, tfl_type: str) -> bool:
+        return tfl_type in self.functions or tfl_type in self.batch_functions
+
+    def check(self, tfl_type: str, request: dict, response: dict) -> CheckResult | None:
+        func: Optional[Callable[[dict, dict], CheckResult]] = self.functions.get(tfl_type)
+        if func is not None:
+            return func(request, response)
+        if tfl_type in self.batch_functions:
+            return self.batch_functions[tfl_type]([request], [response])[0]
+        return None
+
+    def check_batch(self, tfl_type: str, requests: list[dict], responses: list[dict]) -> list[CheckResult] | None:
+        """Проверка всех запросов и ответов одного типа.
+
+        Если для типа зарегистрирована только обычная проверка, она вызывается для каждой пары.
+
+        Returns:
+            list[CheckResult] | None: Результаты в порядке запросов или None, если проверки для типа нет.
+
+        Raises:
+            ValueError: Пакетная проверка вернула другое количество результатов.
+        """
+        batch_func: Optional[Callable[[list[dict], list[dict]], Sequence[CheckResult]]] = \
+            self.batch_functions.get(tfl_type)
+        if batch_func is not None:
+            results: list[CheckResult] = list(batch_func(requests, responses))
+            if len(results) != len(requests):
+                raise ValueError(f'Пакетная проверка типа {tfl_type} вернула {len(results)} результатов '
+                                 f'вместо {len(requests)}')
+            return results
+        func: Optional[Callable[[dict, dict], CheckResult]] = self.functions.get(tfl_type)
+        if func is not None:
+            return Checker.check_each(func, requests, responses)
+        return None
+
+    def get_batch_function(self, tfl_type: str) -> \
+            Optional[Callable[[list[dict], list[dict]], Sequence[CheckResult]]]:
+        """Получение проверки типа в пакетном виде: пакетной проверки или обычной, вызываемой для каждой пары.
+
+        Результат можно передать в пул процессов, если сама функция проверки объявлена на уровне модуля.
+
+        Returns:
+            Optional[Callable]: Функция от списков запросов и ответов или None, если проверки для типа нет.
+        """
+        batch_func: Optional[Callable[[list[dict], list[dict]], Sequence[CheckResult]]] = \
+            self.batch_functions.get(tfl_type)
+        if batch_func is not None:
+            return batch_func
+        func: Optional[Callable[[dict, dict], CheckResult]] = self.functions.get(tfl_type)
+        if func is not None:
+            return partial(Checker.check_each, func)
         return None
+
+    def submit_batch(self, executor: Executor, tfl_type: str, requests: list[dict], responses: list[dict]) -> \
+            Optional[Future]:
+        """Запуск проверки всех запросов и ответов одного типа в пуле, например в пуле процессов.
+
+        Функция проверки передаётся в пул по имени, поэтому она должна быть объявлена на уровне модуля.
+
+        Returns:
+            Optional[Future]: Будущий результат в формате check_batch или None, если проверки для типа нет.
+        """
+        batch_func: Optional[Callable[[list[dict], list[dict]], Sequence[CheckResult]]] = \
+            self.get_batch_function(tfl_type)
+        if batch_func is None:
+            return None
+        return executor.submit(batch_func, requests, responses)
+
+    @staticmethod
+    def check_each(func: Callable[[dict, dict], CheckResult], requests: list[dict], responses: list[dict]) -> \
+            list[CheckResult]:
+        return [func(request, response) for request, response in zip(requests, responses)]
@@ -0,0 +1,72 @@
+"""Модуль предохранителя запросов к сервису.
+
+Если сервис несколько раз подряд не отвечает или отвечает ошибкой 5xx, предохранитель размыкается и
+запросы к нему перестают отправляться до истечения времени восстановления.
+После этого пропускается один пробный запрос: при успехе предохранитель
+замыкается, при ошибке снова размыкается.
+"""
+import threading
+import time
+from enum import Enum
+
+
+class CircuitState(Enum):
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+
+class CircuitBreaker:
+    """Предохранитель для одного url сервиса.
+
+    Attributes:
+        failure_threshold: Количество ошибок подряд, после которого предохранитель размыкается.
+        recovery_time: Сколько секунд предохранитель остаётся разомкнутым.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 10):
+        self.failure_threshold: int = max(1, failure_threshold)
+        self.recovery_time: float = recovery_time
+        self._state: CircuitState = CircuitState.CLOSED
+        self._failures: int = 0
+        self._opened_at: float = 0
+        self._probe_in_progress: bool = False
+        self._lock: threading.Lock = threading.Lock()
+
+    def get_state(self) -> CircuitState:
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Можно ли отправить запрос на сервис.
+
+        Returns:
+            bool: False, если предохранитель разомкнут или пробный запрос уже отправлен.
+        """
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.recovery_time:
+                self._state = CircuitState.HALF_OPEN
+                self._probe_in_progress = False
+            if self._state == CircuitState.HALF_OPEN and not self._probe_in_progress:
+                self._probe_in_progress = True
+                return True
+            return False
+
+    def record_success(self):
+        """Сервис ответил без ошибки 5xx.
+        """
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._probe_in_progress = False
+
+    def record_failure(self):
+        """Сервис не ответил или ответил ошибкой 5xx.
+        """
+        with self._lock:
+            self._failures += 1
+            if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_progress = False
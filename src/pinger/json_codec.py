@@ -0,0 +1,44 @@
+"""Модуль кодирования JSON для долбилки.
+
+Если установлен orjson, запросы и ответы сервиса кодируются через него, иначе используется
+стандартный модуль json. Оба варианта дают одинаковые объекты Python.
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JsonCodec:
+    """Кодирование и разбор JSON самым быстрым доступным способом.
+
+    Attributes:
+        backend: Название используемой библиотеки: "orjson" или "json".
+    """
+    backend: str = 'json' if orjson is None else 'orjson'
+
+    @staticmethod
+    def loads(content: bytes | str) -> Any:
+        """Разбор JSON.
+
+        Raises:
+            ValueError: Содержимое не является корректным JSON.
+        """
+        if orjson is not None:
+            return orjson.loads(content)
+        return json.loads(content)
+
+    @staticmethod
+    def dumps(obj: Any) -> str:
+        if orjson is not None:
+            return orjson.dumps(obj).decode()
+        return json.dumps(obj)
+
+    @staticmethod
+    def dumps_bytes(obj: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(obj)
+        return json.dumps(obj).encode()
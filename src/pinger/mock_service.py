@@ -0,0 +1,343 @@
+"""Модуль локального сервиса светофоров для тестов и нагрузочного тестирования.
+
+Сервис отвечает по тому же протоколу, что и настоящий: GET с параметрами type и data
+возвращает {"next_state": ...}, а пакетный POST возвращает состояния всех переданных светофоров.
+Задержку, долю 4xx/5xx ответов, медленные ответы и обрывы соединения можно настроить, поэтому
+пропускную способность долбилки можно измерять воспроизводимо и без внешнего сервиса.
+
+Сервис можно запустить в текущем процессе через MockTrafficLightService.start() или отдельным процессом:
+    python -m src.pinger.mock_service --port 8081 --latency 0.01 --error-rate 0.05
+"""
+import argparse
+import logging
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+from src.modules.traffic_light_types import TrafficLightTypeRegistry
+from src.pinger.json_codec import JsonCodec
+
+
+class MockTrafficLightService:
+    """Локальный сервис светофоров.
+
+    Светофор переходит в следующее состояние, когда проводит в текущем state_duration тиков,
+    после последнего состояния идёт первое. Количество состояний берётся из типа светофора
+    по значению type, для неизвестных типов используется default_states.
+
+    Attributes:
+        host: Адрес сервиса.
+        port: Порт сервиса. Если 0, порт выбирается при запуске.
+        path: Путь, по которому принимаются запросы.
+        latency: Задержка каждого ответа в секундах.
+        jitter: Случайная добавка к задержке от 0 до jitter секунд.
+        error_rate: Доля ответов с ошибкой 500.
+        client_error_rate: Доля ответов с ошибкой 400.
+        slow_rate: Доля медленных ответов.
+        slow_latency: Дополнительная задержка медленного ответа в секундах.
+        drop_rate: Доля запросов, на которые соединение закрывается без ответа.
+        state_duration: Сколько тиков светофор находится в одном состоянии.
+        default_states: Количество состояний светофора неизвестного типа.
+        seed: Seed случайных ошибок и задержек.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8081, path: str = '/trafficlight',
+                 latency: float = 0, jitter: float = 0, error_rate: float = 0, client_error_rate: float = 0,
+                 slow_rate: float = 0, slow_latency: float = 5, drop_rate: float = 0,
+                 state_duration: int = 1, default_states: int = 3, seed: Optional[int] = None):
+        self.host: str = host
+        self.port: int = port
+        self.path: str = path
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.error_rate: float = error_rate
+        self.client_error_rate: float = client_error_rate
+        self.slow_rate: float = slow_rate
+        self.slow_latency: float = slow_latency
+        self.drop_rate: float = drop_rate
+        self.state_duration: int = max(1, state_duration)
+        self.default_states: int = max(1, default_states)
+        self.seed: Optional[int] = seed
+        self._random: random.Random = random.Random(seed)
+        self._random_lock: threading.Lock = threading.Lock()
+        self._states: Optional[dict[str, int]] = None
+        self._stats: dict[int, int] = {}
+        self._stats_lock: threading.Lock = threading.Lock()
+        self._server: Optional[_MockHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}{self.path}'
+
+    def start(self):
+        """Запуск сервиса в фоновом потоке текущего процесса.
+        """
+        if self._server is not None:
+            return
+        self._server = self._create_server()
+        self._thread = threading.Thread(target=self._server.serve_forever, name='mock-service', daemon=True)
+        self._thread.start()
+        logging.debug('Локальный сервис светофоров запущен на %s', self.url)
+
+    def stop(self):
+        """Остановка сервиса. Открытые keep-alive соединения тоже закрываются, поэтому после
+        остановки сервис недоступен и для уже подключённых клиентов.
+        """
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server.close_connections()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def serve_forever(self):
+        """Запуск сервиса в текущем потоке до прерывания.
+        """
+        self._server = self._create_server()
+        logging.info('Локальный сервис светофоров слушает %s', self.url)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self._server = None
+
+    def get_stats(self) -> dict[int, int]:
+        """Получение количества ответов по статус коду. Оборванные соединения учитываются с кодом -1.
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def get_next_state(self, tfl_type: str, data: dict) -> int:
+        """Следующее состояние светофора (с 1) по параметрам его запроса.
+
+        Raises:
+            KeyError: В данных нет current_state или current_time.
+            ValueError: Значения не являются числами.
+        """
+        states: int = self._get_states().get(tfl_type, self.default_states)
+        current_state: int = int(data['current_state'])
+        if int(data['current_time']) < self.state_duration:
+            return current_state
+        return current_state % states + 1
+
+    @classmethod
+    def spawn(cls, port: int = 8081, timeout: float = 10, **options: Any) -> subprocess.Popen:
+        """Запуск сервиса отдельным процессом и ожидание, пока он начнёт принимать соединения.
+
+        Args:
+            port: Порт сервиса.
+            timeout: Сколько секунд ждать запуска.
+            options: Параметры MockTrafficLightService, например latency=0.01 или error_rate=0.05.
+
+        Raises:
+            TimeoutError: Сервис не начал принимать соединения за timeout секунд.
+        """
+        args: list[str] = [sys.executable, '-m', 'src.pinger.mock_service', '--port', str(port)]
+        for name, value in options.items():
+            if value is not None:
+                args += [f'--{name.replace("_", "-")}', str(value)]
+        process: subprocess.Popen = subprocess.Popen(args)
+
+        host: str = options.get('host') or '127.0.0.1'
+        deadline: float = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f'Локальный сервис светофоров завершился с кодом {process.returncode}')
+            try:
+                with socket.create_connection((host, port), timeout=0.5):
+                    return process
+            except OSError:
+                time.sleep(0.05)
+        process.terminate()
+        raise TimeoutError(f'Локальный сервис светофоров не запустился за {timeout} с')
+
+    def _create_server(self) -> '_MockHTTPServer':
+        server: _MockHTTPServer = _MockHTTPServer((self.host, self.port), self)
+        self.port = server.server_address[1]
+        return server
+
+    def _get_states(self) -> dict[str, int]:
+        if self._states is None:
+            states: dict[str, int] = {}
+            for tfl_type in TrafficLightTypeRegistry.get_all_types():
+                definition = TrafficLightTypeRegistry.get(tfl_type)
+                states[str(definition.type_value)] = len(definition.states)
+            self._states = states
+        return self._states
+
+    def roll(self) -> tuple[Optional[int], float]:
+        """Выбор ошибки и задержки для очередного ответа.
+
+        Returns:
+            tuple[Optional[int], float]: Статус код ошибки (-1 для обрыва соединения) или None и задержка в секундах.
+        """
+        with self._random_lock:
+            delay: float = self.latency + self._random.uniform(0, self.jitter)
+            if self._random.random() < self.slow_rate:
+                delay += self.slow_latency
+            value: float = self._random.random()
+        if value < self.drop_rate:
+            return -1, delay
+        value -= self.drop_rate
+        if value < self.error_rate:
+            return 500, delay
+        value -= self.error_rate
+        if value < self.client_error_rate:
+            return 400, delay
+        return None, delay
+
+    def count(self, status: int):
+        """Учёт ответа с указанным статус кодом в статистике.
+        """
+        with self._stats_lock:
+            self._stats[status] = self._stats.get(status, 0) + 1
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    """HTTP-сервер локального сервиса, который помнит открытые соединения, чтобы закрыть их при остановке.
+    """
+    daemon_threads = True
+
+    def __init__(self, server_address: tuple[str, int], service: MockTrafficLightService):
+        super().__init__(server_address, _MockRequestHandler)
+        self.service: MockTrafficLightService = service
+        self._connections: set[socket.socket] = set()
+        self._connections_lock: threading.Lock = threading.Lock()
+
+    def process_request(self, request: socket.socket, client_address: Any):
+        with self._connections_lock:
+            self._connections.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request: socket.socket):
+        with self._connections_lock:
+            self._connections.discard(request)
+        super().shutdown_request(request)
+
+    def close_connections(self):
+        """Закрытие всех открытых соединений, в том числе ожидающих следующего keep-alive запроса.
+        """
+        with self._connections_lock:
+            connections: list[socket.socket] = list(self._connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class _MockRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: ThreadingHTTPServer
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not self._before_response(url.path):
+            return
+        try:
+            query: dict[str, list[str]] = parse_qs(url.query)
+            next_state: int = self._service.get_next_state(query['type'][0], JsonCodec.loads(query['data'][0]))
+        except (KeyError, IndexError, ValueError, TypeError):
+            self._send(400, {'error': 'Неверные параметры запроса'})
+            return
+        self._send(200, {'next_state': next_state})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            body: bytes = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        except ValueError:
+            self._send(400, {'error': 'Неверная длина запроса'})
+            return
+        if not self._before_response(url.path):
+            return
+        try:
+            traffic_lights: list[dict] = [
+                {'uuid': item['data']['uuid'],
+                 'next_state': self._service.get_next_state(str(item['type']), item['data'])}
+                for item in JsonCodec.loads(body)['traffic_lights']
+            ]
+        except (KeyError, ValueError, TypeError):
+            self._send(400, {'error': 'Неверное тело запроса'})
+            return
+        self._send(200, {'traffic_lights': traffic_lights})
+
+    @property
+    def _service(self) -> MockTrafficLightService:
+        return self.server.service
+
+    def _before_response(self, path: str) -> bool:
+        """Проверка пути, задержка и внедрение ошибок.
+
+        Returns:
+            bool: Нужно ли формировать обычный ответ.
+        """
+        if path != self._service.path:
+            self._send(404, {'error': 'Не найдено'})
+            return False
+        error, delay = self._service.roll()
+        if delay > 0:
+            time.sleep(delay)
+        if error == -1:
+            self._service.count(-1)
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return False
+        if error is not None:
+            self._send(error, {'error': 'Внедрённая ошибка'})
+            return False
+        return True
+
+    def _send(self, status: int, content: dict):
+        body: bytes = JsonCodec.dumps_bytes(content)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self._service.count(status)
+
+    def log_message(self, format: str, *args: Any):
+        logging.debug('Локальный сервис светофоров: ' + format, *args)
+
+
+def parse_args(args: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Локальный сервис светофоров для тестов и нагрузочного тестирования.')
+    parser.add_argument('--host', default='127.0.0.1', help='Адрес сервиса')
+    parser.add_argument('--port', type=int, default=8081, help='Порт сервиса')
+    parser.add_argument('--path', default='/trafficlight', help='Путь, по которому принимаются запросы')
+    parser.add_argument('--latency', type=float, default=0, help='Задержка каждого ответа в секундах')
+    parser.add_argument('--jitter', type=float, default=0, help='Случайная добавка к задержке в секундах')
+    parser.add_argument('--error-rate', type=float, default=0, help='Доля ответов с ошибкой 500')
+    parser.add_argument('--client-error-rate', type=float, default=0, help='Доля ответов с ошибкой 400')
+    parser.add_argument('--slow-rate', type=float, default=0, help='Доля медленных ответов')
+    parser.add_argument('--slow-latency', type=float, default=5, help='Задержка медленного ответа в секундах')
+    parser.add_argument('--drop-rate', type=float, default=0, help='Доля запросов, оборванных без ответа')
+    parser.add_argument('--state-duration', type=int, default=1, help='Сколько тиков светофор находится в состоянии')
+    parser.add_argument('--default-states', type=int, default=3, help='Количество состояний неизвестного типа')
+    parser.add_argument('--seed', type=int, default=None, help='Seed случайных ошибок и задержек')
+    return parser.parse_args(args)
+
+
+def main(args: Optional[list[str]] = None):
+    options: argparse.Namespace = parse_args(args)
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s][%(levelname)s] %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S')
+    service = MockTrafficLightService(**vars(options))
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
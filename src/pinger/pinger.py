@@ -1,22 +1,152 @@
+import asyncio
 import logging
-from typing import TYPE_CHECKING, Optional
-import json
+import multiprocessing
+import os
+import threading
+import time
+from itertools import count
+from random import uniform
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Any, Optional, Callable, Sequence
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
 
-from src.pinger.checker import Checker
+from src.pinger.checker import Checker, CheckResult
+from src.pinger.circuit_breaker import CircuitBreaker
+from src.pinger.json_codec import JsonCodec
+
+from src.modules.traffic_light_data import NoteType
+from src.modules.traffic_light_registry import TrafficLightRegistry
 
 if TYPE_CHECKING:
     from src.modules import TrafficLightData
 
+# Очередь, через которую процесс пула проверок сообщает о начале проверки. Задаётся в каждом процессе пула
+_check_started: Optional[Any] = None
+
+
+def _init_check_worker(started: Any):
+    global _check_started  # pylint: disable=global-statement
+    _check_started = started
+
+
+def _run_check(check_id: int, func: Callable[[list[dict], list[dict]], Sequence[CheckResult]],
+               requests_data: list[dict], responses: list[dict]) -> list[CheckResult]:
+    """Выполнение проверки в процессе пула с отметкой о её начале.
+    """
+    _check_started.put((check_id, time.time()))
+    return list(func(requests_data, responses))
+
+
+class _PendingCheck:
+    """Проверка одного типа светофоров, отправленная в пул процессов.
+
+    Attributes:
+        tfl_type: Тип светофоров.
+        uuids: uuid проверяемых светофоров.
+        status_codes: Статус коды ответов сервиса в порядке uuids.
+        tick: Тик, в котором отправлена проверка.
+        func: Пакетная функция проверки.
+        requests: Запросы светофоров.
+        responses: Ответы сервиса.
+        check_id: Номер отправки проверки в пул.
+        future: Будущий результат проверки.
+        executor: Пул, в который отправлена проверка.
+        started_at: Время начала проверки в процессе пула или None, если она ещё ждёт в очереди.
+    """
+    __slots__ = ('tfl_type', 'uuids', 'status_codes', 'tick', 'func', 'requests', 'responses',
+                 'check_id', 'future', 'executor', 'started_at')
+
+    def __init__(self, tfl_type: str, uuids: list[str], status_codes: list[int], tick: int,
+                 func: Callable[[list[dict], list[dict]], Sequence[CheckResult]],
+                 requests_data: list[dict], responses: list[dict]):
+        self.tfl_type: str = tfl_type
+        self.uuids: list[str] = uuids
+        self.status_codes: list[int] = status_codes
+        self.tick: int = tick
+        self.func: Callable[[list[dict], list[dict]], Sequence[CheckResult]] = func
+        self.requests: list[dict] = requests_data
+        self.responses: list[dict] = responses
+        self.check_id: int = 0
+        self.future: Optional[Future] = None
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.started_at: Optional[float] = None
+
 
 class Pinger:
-    def __init__(self):
-        self.traffic_lights_data: list['TrafficLightData'] = []
+    """Долбилка, опрашивающая сервис о следующем состоянии светофоров.
+
+    Запросы на все светофоры отправляются одновременно: каждый пинг выполняется
+    задачей asyncio, а блокирующий запрос уходит в пул потоков.
+
+    Для каждого url сервиса держится своя сессия с пулом keep-alive соединений,
+    поэтому соединения переиспользуются между запросами и тиками.
+
+    Для типов светофоров с включённым пакетным режимом (batch.use в файле типа) все
+    светофоры с одинаковым url опрашиваются одним POST-запросом за тик.
+
+    Дополнительные проверки ответов (Checker) выполняются после всех запросов тика:
+    ответы группируются по типу светофора, и проверка каждого типа вызывается один раз.
+    Если включён check_in_processes, проверки выполняются в пуле процессов по числу ядер,
+    а их результаты применяются к запискам светофоров в одном из следующих тиков.
+
+    Время, потраченное на неработающий сервис, ограничено: у каждого запроса есть
+    таймауты, неудачные запросы повторяются ограниченное число раз, а после
+    нескольких ошибок подряд предохранитель url перестаёт пропускать запросы.
+
+    Attributes:
+        registry: Реестр опрашиваемых светофоров. Этот же реестр использует поле города.
+        max_concurrency: Максимальное количество одновременных запросов к сервису.
+        pool_size: Максимальное количество соединений в пуле одного url.
+        connect_timeout: Таймаут установки соединения в секундах.
+        read_timeout: Таймаут ожидания ответа в секундах.
+        retries: Количество повторных попыток после ошибки соединения или таймаута.
+        retry_backoff: Базовая задержка перед повторной попыткой в секундах.
+        failure_threshold: Количество ошибок подряд, после которого url отключается.
+        recovery_time: Через сколько секунд отключённый url проверяется снова.
+        check_in_processes: Выполнять ли проверки Checker в пуле процессов, не дожидаясь их в тике.
+        check_timeout: Сколько секунд ждать проверку в пуле процессов. Светофоры с не успевшей
+            проверкой получают записку QUESTION_ERROR.
+        on_response: Необязательный обработчик, вызываемый после каждого HTTP-запроса с url,
+            статус кодом (-1, если ответа нет) и временем выполнения запроса в секундах.
+    """
+
+    def __init__(self, max_concurrency: int = 32, pool_size: int = 32,
+                 connect_timeout: float = 1, read_timeout: float = 2,
+                 retries: int = 2, retry_backoff: float = 0.1,
+                 failure_threshold: int = 5, recovery_time: float = 10,
+                 check_in_processes: bool = False, check_timeout: float = 1):
+        self.registry: TrafficLightRegistry = TrafficLightRegistry()
         self.running: bool = False
         self.checker = Checker()
+        self.max_concurrency: int = max(1, max_concurrency)
+        self.pool_size: int = max(1, pool_size)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_size: int = 0
+        self._sessions: dict[str, requests.Session] = {}
+        self._sessions_lock: threading.Lock = threading.Lock()
+        self.connect_timeout: float = connect_timeout
+        self.read_timeout: float = read_timeout
+        self.retries: int = max(0, retries)
+        self.retry_backoff: float = retry_backoff
+        self.failure_threshold: int = failure_threshold
+        self.recovery_time: float = recovery_time
+        self._circuit_breakers: dict[str, CircuitBreaker] = {}
+        self.check_in_processes: bool = check_in_processes
+        self.check_timeout: float = check_timeout
+        self._check_executor: Optional[ProcessPoolExecutor] = None
+        self._check_started: Optional[Any] = None
+        self._check_ids: count = count(1)
+        self._pending_checks: list[_PendingCheck] = []
+        self._tick: int = 0
+        self._result_ticks: dict[str, int] = {}
+        self._check_notes: dict[str, tuple[Optional[NoteType], Optional[str]]] = {}
+        self.on_response: Optional[Callable[[str, int, float], None]] = None
 
-    def add_traffic_light(self, traffic_light: 'TrafficLightData'):
-        self.traffic_lights_data.append(traffic_light)
+    def add_traffic_light(self, traffic_light: 'TrafficLightData', pos: Optional[tuple[int, int]] = None):
+        self.registry.add(traffic_light, pos)
 
     def ping(self) -> dict[str, Optional[tuple[bool, str, int]]]:
         """Пинг всех светофоров на сервис.
@@ -25,41 +155,554 @@ class Pinger:
             dict[str, Optional[tuple[bool, str, int]]]: Список всех светофоров с их ошибками.
 
         """
+        self._tick += 1
+        traffic_lights_data: list['TrafficLightData'] = self.registry.get_all()
+        checks: dict[str, tuple[dict, dict]] = {}
+        results: dict[str, Optional[tuple[bool, str, int]]] = asyncio.run(
+            self._ping_all(traffic_lights_data, checks))
+        submitted: set[str] = set()
+        if self.check_in_processes:
+            failed_checks: dict[str, list[str]] = self._submit_checks(traffic_lights_data, results, checks)
+            submitted = {uuid for check in self._pending_checks if check.tick == self._tick for uuid in check.uuids}
+        else:
+            failed_checks = self._run_checks(traffic_lights_data, results, checks)
+        for data in traffic_lights_data:
+            if data.uuid not in submitted:
+                # Окончательный результат этого тика: более старые проверки из пула его не перезаписывают
+                self._result_ticks[data.uuid] = self._tick
+                self._check_notes.pop(data.uuid, None)
+            elif data.uuid in self._check_notes:
+                # Записка прошлой проверки остаётся, пока не придёт результат новой
+                data.status = results[data.uuid][2]
+                data.note.set_level(self._check_notes[data.uuid][0])
+                data.note.note = self._check_notes[data.uuid][1]
+                continue
+            self._apply_result(data, results[data.uuid])
+        for tfl_type, uuids in failed_checks.items():
+            self._set_check_error(uuids, f'Проверка светофора типа {tfl_type} завершилась с ошибкой.')
+        if self._pending_checks:
+            self._collect_checks(results)
+        return results
+
+    @staticmethod
+    def _apply_result(data: 'TrafficLightData', result: Optional[tuple[bool, str, int]]):
+        """Обновление записки светофора по результату пинга.
+        """
+        if result is not None:
+            data.status = result[2]
+        if result is None:
+            logging.warning('Не удалось выполнить проверку светофора %s типа %s.',
+                            data.uuid, data.tfl_type)
+            data.note.set_level(5)
+            data.note.note = f'Не удалось выполнить проверку светофора типа {data.tfl_type}.'
+        elif 100 <= result[2] <= 299:
+            logging.info('Проверка светофора %s прошла успешно.',
+                         data.uuid)
+            data.note.set_level(None)
+            data.note.note = None
+        elif result[2] == -1:
+            logging.info('Не удалось соединиться с сервисом. (Запрос на url: %s).',
+                         data.url)
+            data.note.set_level(2)
+            data.note.note = f'Не удалось соединиться с сервисом. {result[1]}.'
+        elif 500 <= result[2] <= 599:
+            logging.error('При запросе светофора %s типа %s сервис упал с 500-ой ошибкой.',
+                          data.uuid, data.tfl_type)
+            data.note.set_level(4)
+            data.note.note = result[1]
+        elif not result[0]:
+            logging.warning('Проверка светофора %s типа %s привела к ошибке "%s".',
+                            data.uuid, data.tfl_type, result[1])
+            data.note.set_level(4)
+            data.note.note = result[1]
+
+    def _run_checks(self, traffic_lights_data: list['TrafficLightData'],
+                    results: dict[str, Optional[tuple[bool, str, int]]], checks: dict[str, tuple[dict, dict]]) -> \
+            dict[str, list[str]]:
+        """Дополнительная проверка ответов сервиса, по одному вызову Checker на тип светофора.
+
+        Результаты светофоров без проверки для их типа заменяются на None. Если проверка типа упала
+        с ошибкой, результаты его светофоров не меняются, а сами светофоры возвращаются для записки
+        QUESTION_ERROR.
+
+        Args:
+            traffic_lights_data: Данные светофоров.
+            results: Результаты пинга по uuid светофора. Изменяются на месте.
+            checks: Запросы и ответы светофоров, получивших ответ сервиса.
+
+        Returns:
+            dict[str, list[str]]: uuid светофоров по типам, проверка которых упала с ошибкой.
+        """
+        by_type: dict[str, list[str]] = {}
+        for data in traffic_lights_data:
+            if data.uuid in checks:
+                by_type.setdefault(data.tfl_type, []).append(data.uuid)
+
+        failed: dict[str, list[str]] = {}
+        for tfl_type, uuids in by_type.items():
+            try:
+                checked: Optional[list[CheckResult]] = self.checker.check_batch(
+                    tfl_type, [checks[uuid][0] for uuid in uuids], [checks[uuid][1] for uuid in uuids])
+            except Exception:  # pylint: disable=broad-exception-caught
+                logging.exception('Проверка светофоров типа %s завершилась с ошибкой.', tfl_type)
+                failed[tfl_type] = uuids
+                continue
+            for i, uuid in enumerate(uuids):
+                if checked is None:
+                    results[uuid] = None
+                    continue
+                status_code: int = results[uuid][2]
+                results[uuid] = checked[i][0], checked[i][1], status_code if checked[i][0] else 400
+        return failed
+
+    def _submit_checks(self, traffic_lights_data: list['TrafficLightData'],
+                       results: dict[str, Optional[tuple[bool, str, int]]], checks: dict[str, tuple[dict, dict]]) -> \
+            dict[str, list[str]]:
+        """Запуск дополнительной проверки ответов в пуле процессов, по одной задаче на тип светофора.
+
+        До окончания проверки результаты светофоров остаются успешными. Результаты светофоров
+        без проверки для их типа заменяются на None.
+
+        Returns:
+            dict[str, list[str]]: uuid светофоров по типам, проверку которых не удалось отправить в пул.
+        """
+        by_type: dict[str, list[str]] = {}
+        for data in traffic_lights_data:
+            if data.uuid in checks:
+                by_type.setdefault(data.tfl_type, []).append(data.uuid)
+
+        failed: dict[str, list[str]] = {}
+        for tfl_type, uuids in by_type.items():
+            func: Optional[Callable[[list[dict], list[dict]], Sequence[CheckResult]]] = \
+                self.checker.get_batch_function(tfl_type)
+            if func is None:
+                for uuid in uuids:
+                    results[uuid] = None
+                continue
+            check: _PendingCheck = _PendingCheck(tfl_type, uuids, [results[uuid][2] for uuid in uuids], self._tick,
+                                                 func, [checks[uuid][0] for uuid in uuids],
+                                                 [checks[uuid][1] for uuid in uuids])
+            if self._start_check(check):
+                self._pending_checks.append(check)
+            else:
+                failed[tfl_type] = uuids
+        return failed
+
+    def _start_check(self, check: _PendingCheck) -> bool:
+        """Отправка проверки в пул процессов. Если пул сломан, он заменяется новым.
+
+        Returns:
+            bool: Удалось ли отправить проверку.
+        """
+        for _ in range(2):
+            executor: ProcessPoolExecutor = self._get_check_executor()
+            check.check_id = next(self._check_ids)
+            check.started_at = None
+            try:
+                check.future = executor.submit(_run_check, check.check_id, check.func, check.requests,
+                                               check.responses)
+            except BrokenProcessPool:
+                logging.warning('Пул процессов проверок сломан и будет создан заново.')
+                self._stop_check_executor()
+                continue
+            check.executor = executor
+            return True
+        logging.error('Не удалось отправить проверку светофоров типа %s в пул процессов.', check.tfl_type)
+        return False
+
+    def _collect_checks(self, results: dict[str, Optional[tuple[bool, str, int]]]):
+        """Применение готовых результатов проверок из пула процессов.
+
+        Проверка применяется к светофору, только если у него нет более нового результата: ошибки пинга
+        или проверки из более позднего тика. В results попадают только проверки текущего тика, результаты
+        прошлых тиков меняют лишь записки. Светофоры, проверка которых не выполнилась за check_timeout
+        с момента её начала в процессе пула, упала с ошибкой или потеряла процесс, получают записку
+        QUESTION_ERROR.
+
+        Если проверка зависла или процесс пула завершился, пул перезапускается, а остальные
+        незавершённые проверки отправляются в новый пул.
+        """
+        self._read_check_starts()
+        pending: list[_PendingCheck] = []
+        restart: bool = False
+        now: float = time.time()
+        for check in self._pending_checks:
+            if check.future.cancelled():
+                continue
+            if not check.future.done():
+                if check.started_at is None or now < check.started_at + self.check_timeout:
+                    pending.append(check)
+                    continue
+                logging.warning('Проверка светофоров типа %s не выполнилась за %s с.',
+                                check.tfl_type, self.check_timeout)
+                self._set_check_error(self._take_fresh(check.uuids, check.tick),
+                                      f'Проверка светофора типа {check.tfl_type} не выполнилась '
+                                      f'за {self.check_timeout} с.')
+                restart = restart or check.executor is self._check_executor
+                continue
+            try:
+                checked: list[CheckResult] = list(check.future.result())
+                if len(checked) != len(check.uuids):
+                    raise ValueError(f'Пакетная проверка типа {check.tfl_type} вернула {len(checked)} результатов '
+                                     f'вместо {len(check.uuids)}')
+            except BrokenProcessPool:
+                logging.error('Процесс пула проверок завершился во время проверки светофоров типа %s.',
+                              check.tfl_type)
+                self._set_check_error(self._take_fresh(check.uuids, check.tick),
+                                      f'Процесс проверки светофора типа {check.tfl_type} завершился аварийно.')
+                restart = restart or check.executor is self._check_executor
+                continue
+            except Exception as e:
+                logging.error('Проверка светофоров типа %s завершилась с ошибкой: %s', check.tfl_type, e)
+                self._set_check_error(self._take_fresh(check.uuids, check.tick),
+                                      f'Проверка светофора типа {check.tfl_type} завершилась с ошибкой.')
+                continue
+            fresh: set[str] = set(self._take_fresh(check.uuids, check.tick))
+            for uuid, status_code, (ok, message) in zip(check.uuids, check.status_codes, checked):
+                data: Optional['TrafficLightData'] = self.registry.get(uuid)
+                if data is None or uuid not in fresh:
+                    continue
+                result: tuple[bool, str, int] = ok, message, status_code if ok else 400
+                if check.tick == self._tick:
+                    results[uuid] = result
+                self._apply_result(data, result)
+                self._check_notes[uuid] = data.note.get_level(), data.note.note
+        self._pending_checks = pending
+
+        if restart:
+            # Зависшую проверку нельзя прервать внутри процесса, поэтому пул останавливается вместе
+            # с процессами, а незавершённые проверки других типов отправляются в новый пул.
+            # Незавершённые проверки отбираются до остановки: после неё их результатом станет ошибка пула
+            unfinished: list[_PendingCheck] = [check for check in pending if check.executor is self._check_executor
+                                               and not check.future.done()]
+            self._stop_check_executor()
+            self._pending_checks = [check for check in pending if check not in unfinished]
+            for check in unfinished:
+                if self._start_check(check):
+                    self._pending_checks.append(check)
+                else:
+                    self._set_check_error(self._take_fresh(check.uuids, check.tick),
+                                          f'Проверка светофора типа {check.tfl_type} завершилась с ошибкой.')
+
+    def _read_check_starts(self):
+        """Запоминание времени начала проверок, о котором сообщили процессы пула.
+        """
+        if self._check_started is None:
+            return
+        started: dict[int, float] = {}
+        while not self._check_started.empty():
+            check_id, started_at = self._check_started.get()
+            started[check_id] = started_at
+        for check in self._pending_checks:
+            if check.started_at is None and check.check_id in started:
+                check.started_at = started[check.check_id]
+
+    def _take_fresh(self, uuids: list[str], tick: int) -> list[str]:
+        """Отбор светофоров, для которых проверка тика tick новее их последнего результата.
+
+        Для отобранных светофоров проверка этого тика запоминается как последний результат.
+        """
+        fresh: list[str] = []
+        for uuid in uuids:
+            if self._result_ticks.get(uuid, 0) < tick:
+                self._result_ticks[uuid] = tick
+                fresh.append(uuid)
+        return fresh
+
+    def _set_check_error(self, uuids: list[str], note: str):
+        for uuid in uuids:
+            data: Optional['TrafficLightData'] = self.registry.get(uuid)
+            if data is None:
+                continue
+            data.note.set_level(NoteType.QUESTION_ERROR)
+            data.note.note = note
+            if self.check_in_processes:
+                self._check_notes[uuid] = NoteType.QUESTION_ERROR, note
+
+    def _get_check_executor(self) -> ProcessPoolExecutor:
+        """Получение пула процессов для проверок размером по числу ядер.
+
+        Процессы запускаются методом spawn, так как основной процесс держит потоки и окно pygame.
+        Каждый процесс сообщает о начале проверки через общую очередь, чтобы время ожидания
+        в очереди пула и запуска процессов не считалось в check_timeout.
+        """
+        if self._check_executor is None:
+            context = multiprocessing.get_context('spawn')
+            self._check_started = context.SimpleQueue()
+            self._check_executor = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=context,
+                                                       initializer=_init_check_worker,
+                                                       initargs=(self._check_started,))
+        return self._check_executor
+
+    def _stop_check_executor(self):
+        """Остановка пула процессов проверок с завершением его процессов, в том числе зависших.
+        """
+        if self._check_executor is None:
+            return
+        # pylint: disable=protected-access
+        processes: list[multiprocessing.Process] = list((self._check_executor._processes or {}).values())
+        self._check_executor.shutdown(wait=False, cancel_futures=True)
+        self._check_executor = None
+        self._check_started = None
+        for process in processes:
+            process.terminate()
+
+    async def _ping_all(self, traffic_lights_data: list['TrafficLightData'], checks: dict[str, tuple[dict, dict]]) -> \
+            dict[str, Optional[tuple[bool, str, int]]]:
+        """Одновременный пинг переданных светофоров.
+
+        Args:
+            traffic_lights_data: Данные светофоров.
+            checks: Словарь, в который складываются запросы и ответы для дополнительной проверки.
+
+        Returns:
+            dict[str, Optional[tuple[bool, str, int]]]: Результаты пинга по uuid светофора.
+        """
+        loop = asyncio.get_running_loop()
+        executor: ThreadPoolExecutor = self._get_executor()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def ping_one(data: 'TrafficLightData') -> dict[str, Optional[tuple[bool, str, int]]]:
+            async with semaphore:
+                return {data.uuid: await loop.run_in_executor(executor, self._ping_traffic_light, data, checks)}
+
+        async def ping_batch(url: str, batch: list['TrafficLightData']) -> \
+                dict[str, Optional[tuple[bool, str, int]]]:
+            async with semaphore:
+                return await loop.run_in_executor(executor, self._ping_batch, url, batch, checks)
+
+        batches: dict[str, list['TrafficLightData']] = {}
+        tasks = []
+        for data in traffic_lights_data:
+            if data.batch:
+                batches.setdefault(data.url, []).append(data)
+            else:
+                tasks.append(ping_one(data))
+        for url, batch in batches.items():
+            tasks.append(ping_batch(url, batch))
+
         results: dict[str, Optional[tuple[bool, str, int]]] = {}
-        for data in self.traffic_lights_data:
-            result: Optional[tuple[bool, str, int]] = self._ping_traffic_light(data)
-            results[data.uuid] = result
-            if result is None:
-                logging.warning('Не удалось выполнить проверку светофора %s типа %s.',
-                                data.uuid, data.tfl_type)
-                data.note.set_level(5)
-                data.note.note = f'Не удалось выполнить проверку светофора типа {data.tfl_type}.'
-            elif 100 <= result[2] <= 299:
-                logging.info('Проверка светофора %s прошла успешно.',
-                             data.uuid)
-                data.note.set_level(None)
-                data.note.note = None
-            elif result[2] == -1:
-                logging.info('Не удалось соединиться с сервисом. (GET-запрос на url: %s).',
-                             data.url)
-                data.note.set_level(2)
-                data.note.note = 'Не удалось соединиться с сервисом.'
-            elif 500 <= result[2] <= 599:
-                logging.error('При запросе светофора %s типа %s сервис упал с 500-ой ошибкой.',
-                              data.uuid, data.tfl_type)
-                data.note.set_level(4)
-                data.note.note = result[1]
-            elif not result[0]:
-                logging.warning('Проверка светофора %s типа %s привела к ошибке "%s".',
-                                data.uuid, data.tfl_type, result[1])
-                data.note.set_level(4)
-                data.note.note = result[1]
+        for task_results in await asyncio.gather(*tasks):
+            results.update(task_results)
         return results
 
-    def _ping_traffic_light(self, data: 'TrafficLightData') -> Optional[tuple[bool, str, int]]:
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Получение пула потоков для запросов. Пул пересоздаётся при изменении max_concurrency.
+        """
+        if self._executor is None or self._executor_size != self.max_concurrency:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                thread_name_prefix='pinger')
+            self._executor_size = self.max_concurrency
+        return self._executor
+
+    def get_session(self, url: str) -> requests.Session:
+        """Получение сессии с пулом соединений для url сервиса.
+
+        Args:
+            url: Адрес сервиса из файла типа светофора.
+
+        Returns:
+            requests.Session: Сессия, общая для всех светофоров с этим url.
+        """
+        session: Optional[requests.Session] = self._sessions.get(url)
+        if session is not None:
+            return session
+        with self._sessions_lock:
+            if url not in self._sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[url] = session
+            return self._sessions[url]
+
+    def get_circuit_breaker(self, url: str) -> CircuitBreaker:
+        """Получение предохранителя для url сервиса.
+
+        Args:
+            url: Адрес сервиса из файла типа светофора.
+        """
+        breaker: Optional[CircuitBreaker] = self._circuit_breakers.get(url)
+        if breaker is not None:
+            return breaker
+        with self._sessions_lock:
+            return self._circuit_breakers.setdefault(url, CircuitBreaker(self.failure_threshold,
+                                                                         self.recovery_time))
+
+    def get_pool_stats(self) -> dict[str, dict[str, int]]:
+        """Получение статистики пулов соединений.
+
+        Returns:
+            dict[str, dict[str, int]]: Статистика по каждому url, где:
+                - requests: Количество отправленных запросов.
+                - new_connections: Количество открытых соединений.
+                - reused_connections: Количество запросов, отправленных по уже открытому соединению.
+        """
+        stats: dict[str, dict[str, int]] = {}
+        for url, session in list(self._sessions.items()):
+            sent: int = 0
+            opened: int = 0
+            adapter: HTTPAdapter = session.get_adapter(url)
+            for key in adapter.poolmanager.pools.keys():
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                sent += pool.num_requests
+                opened += pool.num_connections
+            stats[url] = {
+                'requests': sent,
+                'new_connections': opened,
+                'reused_connections': max(0, sent - opened),
+            }
+        return stats
+
+    def close(self):
+        """Закрытие всех соединений, пула потоков и пула процессов проверок.
+        """
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._stop_check_executor()
+        self._pending_checks = []
+        self._result_ticks = {}
+        self._check_notes = {}
+
+    def _send(self, method: str, url: str, idempotent: bool = True, **kwargs) -> requests.Response:
+        """Отправка запроса с таймаутами и повторными попытками.
+
+        Повторяются только ошибки соединения и таймауты. Перед каждой повторной попыткой
+        выдерживается экспоненциально растущая задержка со случайным разбросом. Ответ с ошибкой 5xx
+        возвращается вызывающему, но для предохранителя url считается неудачей.
+
+        Args:
+            method: HTTP-метод.
+            url: Адрес сервиса.
+            idempotent: Можно ли безопасно повторить запрос, который мог дойти до сервиса. Если False,
+                запрос повторяется только при ошибке установки соединения, а таймаут ответа
+                и обрыв соединения после отправки не повторяются.
+
+        Raises:
+            requests.exceptions.ConnectionError: Сервис недоступен после всех попыток.
+            requests.exceptions.Timeout: Сервис не ответил вовремя после всех попыток.
+        """
+        breaker: CircuitBreaker = self.get_circuit_breaker(url)
+        session: requests.Session = self.get_session(url)
+        attempt: int = 0
+        while True:
+            started_at: float = time.perf_counter()
+            try:
+                response: requests.Response = session.request(
+                    method, url, timeout=(self.connect_timeout, self.read_timeout), **kwargs)
+                if response.status_code >= 500:
+                    # Сервис, который отвечает только ошибками 5xx, так же неработоспособен, как недоступный
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if self.on_response is not None:
+                    self.on_response(url, response.status_code, time.perf_counter() - started_at)
+                return response
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if self.on_response is not None:
+                    self.on_response(url, -1, time.perf_counter() - started_at)
+                if attempt >= self.retries or not (idempotent or Pinger._is_connect_error(e)):
+                    breaker.record_failure()
+                    raise
+            time.sleep(uniform(0, self.retry_backoff * 2 ** attempt))
+            attempt += 1
+
+    @staticmethod
+    def _is_connect_error(error: requests.exceptions.RequestException) -> bool:
+        """Произошла ли ошибка до отправки запроса, то есть при установке соединения.
+        """
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        reason = error.args[0] if error.args else None
+        return isinstance(getattr(reason, 'reason', reason), NewConnectionError)
+
+    def _ping_batch(self, url: str, traffic_lights_data: list['TrafficLightData'],
+                    checks: dict[str, tuple[dict, dict]]) -> \
+            dict[str, Optional[tuple[bool, str, int]]]:
+        """Пинг всех светофоров одного url одним запросом.
+
+        Тело запроса: {"traffic_lights": [{"type": ..., "data": {...}}, ...]}, где каждый элемент
+        совпадает с параметрами одиночного запроса. Сервис возвращает
+        {"traffic_lights": [{"uuid": ..., "next_state": ...}, ...]}, ответы сопоставляются по uuid.
+
+        Args:
+            url: Адрес сервиса.
+            traffic_lights_data: Данные светофоров с этим url.
+            checks: Словарь, в который складываются запросы и ответы для дополнительной проверки.
+
+        Returns:
+            dict[str, Optional[tuple[bool, str, int]]]: Результаты в формате _ping_traffic_light по uuid.
+        """
+        requests_data: dict[str, dict] = {data.uuid: self._get_request_data(data) for data in traffic_lights_data}
+
+        def same_for_all(result: tuple[bool, str, int]) -> dict[str, Optional[tuple[bool, str, int]]]:
+            return {data.uuid: result for data in traffic_lights_data}
+
+        if not self.get_circuit_breaker(url).allow_request():
+            return same_for_all((False, 'Сервис отключён после нескольких неудачных запросов', -1))
+        try:
+            # Пакетный запрос меняет состояние всех светофоров, поэтому после отправки он не повторяется
+            response = self._send('POST', url, idempotent=False,
+                                  data=JsonCodec.dumps_bytes({'traffic_lights': list(requests_data.values())}),
+                                  headers={'Content-Type': 'application/json'})
+        except requests.exceptions.ConnectionError:
+            return same_for_all((False, 'Сервер недоступен', -1))
+        except requests.exceptions.Timeout:
+            return same_for_all((False, 'Сервер не ответил вовремя', -1))
+        if 500 <= response.status_code <= 599:
+            return same_for_all((False, 'Сервер упал с 500-ой ошибкой', response.status_code))
+        if 400 <= response.status_code <= 499:
+            return same_for_all((False, 'Сервер вернул 400-ую ошибку', response.status_code))
+
+        try:
+            responses: dict[str, dict] = {
+                str(item['uuid']): item for item in JsonCodec.loads(response.content)['traffic_lights']
+            }
+        except (ValueError, KeyError, TypeError):
+            return same_for_all((False, 'Сервер вернул ответ в неверном формате', 400))
+
+        results: dict[str, Optional[tuple[bool, str, int]]] = {}
+        for data in traffic_lights_data:
+            if data.uuid not in responses:
+                results[data.uuid] = False, 'Сервер не вернул состояние светофора', 400
+                continue
+            try:
+                data.advance(int(responses[data.uuid]['next_state']) - 1)
+            except (ValueError, KeyError, TypeError, IndexError):
+                results[data.uuid] = False, 'Сервер вернул ответ в неверном формате', 400
+                continue
+            checks[data.uuid] = requests_data[data.uuid], responses[data.uuid]
+            results[data.uuid] = True, None, response.status_code
+        return results
+
+    @staticmethod
+    def _get_request_data(data: 'TrafficLightData') -> dict:
+        """Параметры запроса светофора. Этот же словарь передаётся в дополнительную проверку.
+        """
+        return {
+            'type': str(data.type_value),
+            'data': {
+                'uuid': str(data.uuid),
+                'current_time': data.current_time,
+                'current_state': data.get_state() + 1
+            }
+        }
+
+    def _ping_traffic_light(self, data: 'TrafficLightData', checks: dict[str, tuple[dict, dict]]) -> \
+            Optional[tuple[bool, str, int]]:
         """Пинг отдельного светофора.
         Args:
             data: Данные светофора
+            checks: Словарь, в который складываются запрос и ответ для дополнительной проверки
 
         Returns:
             Optional[tuple[bool, str, int]]:
@@ -69,34 +712,28 @@ class Pinger:
                 Вторым значением строка, которая описывает ошибку.
                 Третьим значением статус код ответа.
         """
+        if not self.get_circuit_breaker(data.url).allow_request():
+            return False, 'Сервис отключён после нескольких неудачных запросов', -1
+        request: dict = self._get_request_data(data)
         try:
-            response = requests.get(data.url, params={
-                'type': str(data.type_value),
-                'data': json.dumps({
-                    'uuid': str(data.uuid),
-                    'current_time': data.current_time,
-                    'current_state': data.get_state() + 1
-                })
+            response = self._send('GET', data.url, params={
+                'type': request['type'],
+                'data': JsonCodec.dumps(request['data'])
             })
             if 500 <= response.status_code <= 599:
                 return False, 'Сервер упал с 500-ой ошибкой', response.status_code
             if 400 <= response.status_code <= 499:
                 return False, 'Сервер вернул 400-ую ошибку', response.status_code
 
-            data.current_time += 1
-            data.set_state(int(json.loads(response.content)['next_state']) - 1)
-            data.note.set_level(None)
+            try:
+                content: dict = JsonCodec.loads(response.content)
+                data.advance(int(content['next_state']) - 1)
+            except (ValueError, KeyError, TypeError, IndexError):
+                return False, 'Сервер вернул ответ в неверном формате', 400
 
-            checking: tuple[bool, Optional[str]] = self.checker.check(data.tfl_type, {
-                'type': str(data.type_value),
-                'data': {
-                    'uuid': str(data.uuid),
-                    'current_time': data.current_time,
-                    'current_state': data.get_state() + 1
-                }
-            }, json.loads(response.content))
-            if checking is None:
-                return None
-            return checking[0], checking[1], response.status_code if checking[0] else 400
+            checks[data.uuid] = request, content
+            return True, None, response.status_code
         except requests.exceptions.ConnectionError:
             return False, 'Сервер недоступен', -1
+        except requests.exceptions.Timeout:
+            return False, 'Сервер не ответил вовремя', -1
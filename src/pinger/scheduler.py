@@ -0,0 +1,86 @@
+"""Модуль фонового планировщика пинга.
+
+Пинг выполняется в отдельном потоке, чтобы задержки сервиса не влияли на
+частоту кадров. Результаты каждого пинга складываются в потокобезопасную
+очередь, которую сцены разбирают раз в кадр.
+"""
+import logging
+import threading
+import time
+from queue import Queue, Empty
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from src.pinger import Pinger
+
+
+class PingScheduler:
+    """Фоновый поток, пингующий светофоры с заданным интервалом.
+
+    Attributes:
+        pinger: Долбилка, через которую выполняется пинг.
+        interval: Интервал между началами пингов в секундах.
+        results: Очередь с результатами пингов в формате Pinger.ping().
+        last_ping_time: Время завершения последнего пинга.
+    """
+
+    def __init__(self, pinger: 'Pinger', interval: float = 1):
+        self.pinger: 'Pinger' = pinger
+        self.interval: float = interval
+        self.results: Queue[dict[str, Optional[tuple[bool, str, int]]]] = Queue()
+        self.last_ping_time: float = 0
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Запуск фонового потока пинга.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='ping-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Остановка фонового потока пинга.
+
+        Args:
+            timeout: Сколько секунд ждать завершения текущего пинга.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def drain(self) -> list[dict[str, Optional[tuple[bool, str, int]]]]:
+        """Получение всех накопившихся результатов пинга без ожидания.
+
+        Returns:
+            list[dict[str, Optional[tuple[bool, str, int]]]]: Результаты пингов в порядке их выполнения.
+        """
+        results: list[dict[str, Optional[tuple[bool, str, int]]]] = []
+        while True:
+            try:
+                results.append(self.results.get_nowait())
+            except Empty:
+                return results
+
+    def clear(self):
+        """Удаление накопившихся результатов пинга.
+        """
+        self.drain()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            delay: float = self.last_ping_time + self.interval - time.time()
+            if delay > 0:
+                self._stop_event.wait(delay)
+                continue
+            if not self.pinger.running:
+                self._stop_event.wait(0.05)
+                continue
+            try:
+                self.results.put(self.pinger.ping())
+            except Exception:  # pylint: disable=broad-exception-caught
+                logging.exception('Ошибка при фоновом пинге светофоров.')
+            self.last_ping_time = time.time()
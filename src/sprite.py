@@ -9,10 +9,12 @@
 - Автоматическая работа с поверхностями (Surface)
 - Поддержка прозрачности (SRCALPHA)
 - Абстрактные методы для обязательной реализации
+- Учёт изменившихся областей для перерисовки только их на экране
 """
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional, Callable
 from abc import ABC, abstractmethod
+from functools import wraps
 
 from pygame import Surface, sprite, Rect, SRCALPHA
 
@@ -37,8 +39,30 @@ class Sprite(sprite.Sprite, ABC):
             Все наследники должны реализовать абстрактные методы:
             - update_view()
             - update()
+
+            После каждого вызова update_view() спрайт целиком помечается изменившимся, чтобы
+            Game перерисовал его область на экране. Если спрайт сам пометил более точные
+            области через mark_dirty(rect), то перерисованы будут только они, а если изображение
+            не изменилось, спрайт может сообщить об этом через mark_unchanged().
         """
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'update_view' in cls.__dict__:
+            cls.update_view = Sprite._marking_dirty(cls.__dict__['update_view'])
+
+    @staticmethod
+    def _marking_dirty(update_view: Callable[['Sprite'], None]) -> Callable[['Sprite'], None]:
+        @wraps(update_view)
+        def wrapper(self: 'Sprite', *args, **kwargs):
+            self._marked = False
+            result = update_view(self, *args, **kwargs)
+            if not self._marked:
+                self.mark_dirty()
+            return result
+
+        return wrapper
+
     def __init__(self, game: 'Game', size: tuple[int, int], position: tuple[int, int] = (0, 0)):
         """Инициализирует спрайт.
 
@@ -52,6 +76,37 @@ class Sprite(sprite.Sprite, ABC):
         self.image: Surface = Surface(size, SRCALPHA, 32).convert_alpha()
         self.rect: Rect = self.image.get_rect()
         self.rect.x, self.rect.y = position[0], position[1]
+        self._dirty: bool = True
+        self._dirty_rects: list[Rect] = []
+        self._marked: bool = False
+
+    def mark_dirty(self, rect: Optional[Rect] = None):
+        """Пометить область спрайта изменившейся.
+
+        Args:
+            rect: Область в координатах спрайта. Если не указана, изменившимся считается весь спрайт.
+        """
+        self._marked = True
+        if rect is None:
+            self._dirty = True
+            self._dirty_rects = []
+        elif not self._dirty:
+            self._dirty_rects.append(Rect(rect))
+
+    def mark_unchanged(self):
+        """Сообщить, что текущий вызов update_view() не изменил изображение спрайта.
+        """
+        self._marked = True
+
+    def pop_dirty_rects(self) -> tuple[bool, list[Rect]]:
+        """Получение и сброс изменившихся областей.
+
+        Returns:
+            tuple[bool, list[Rect]]: Изменился ли спрайт целиком и изменившиеся области в координатах спрайта.
+        """
+        dirty, rects = self._dirty, self._dirty_rects
+        self._dirty, self._dirty_rects = False, []
+        return dirty, rects
 
     @abstractmethod
     def update_view(self):
@@ -2,9 +2,12 @@ from .text import *
 from .button import Button, InBlockText, ButtonStatus
 from .input import Input, Formatting
 from .tile import TileTexture, Tile
+from .tile_atlas import TileAtlas
+from .field_chunks import FieldChunks
 from .field import Field
 from .choice_of_several_options import ChoiceOfSeveralOptions, Option
 from .pixelart import Pixelart
+from .note_icon import NoteIcon
 from .container import Container
 from .traffic_light import TrafficLight
 from .tile_selection import TileSelection
@@ -12,3 +15,4 @@ from .traffic_light_info import TrafficLightInfo
 from .city_info import CityInfo
 from .jumper import Jumper
 from .jumpers_group import JumpersGroup
+from .loading_overlay import LoadingOverlay
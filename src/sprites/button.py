@@ -62,10 +62,16 @@ class Button(Sprite):
         self.enabled: bool = enabled
         self.offset: tuple[int, int] = offset
         self.placeholder: Callable[[], pg.Surface] | None = placeholder
+        self._drawn: Optional[tuple[ButtonView, bool, pg.Surface]] = None
 
         text.correct_position(size)
 
     def update_view(self):
+        drawn: tuple[ButtonView, bool, pg.Surface] = (self.view, self.enabled, self.text.image)
+        if self.placeholder is None and drawn == self._drawn:
+            self.mark_unchanged()
+            return
+        self._drawn = drawn
         if self.view == ButtonView.PRESSED or not self.enabled:
             self.image.fill((58, 58, 58))
         elif self.view == ButtonView.HOVERED:
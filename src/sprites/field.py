@@ -1,12 +1,15 @@
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Mapping
+from math import ceil
 import pygame as pg
 from pathlib import Path
 from os import path
 
 from src.sprite import Sprite
-from src.sprites import Tile, TileTexture
+from src.sprites import Tile, TileTexture, TileAtlas
+from src.sprites.field_chunks import FieldChunks
+from src.sprites.note_icon import NoteIcon
 
-from src.modules import MapGenerator
+from src.modules import MapGenerator, VisibleTiles, InfiniteMap, TrafficLightRegistry
 
 if TYPE_CHECKING:
     from src.game import Game
@@ -15,7 +18,9 @@ if TYPE_CHECKING:
 
 class Field(Sprite):
     """
-    Поле занимает весь экран и состоит из объектов типа Tile
+    Поле занимает весь экран и состоит из объектов типа Tile.
+    Тайлы рисуются не по одному, а заранее отрисованными кусками из FieldChunks.
+    Данные светофоров берутся из общего с долбилкой реестра TrafficLightRegistry
     """
 
     def __init__(self, game: 'Game'):
@@ -29,9 +34,13 @@ class Field(Sprite):
         self.move_speed: int = 15
         self.debug_view_mode: bool = False
 
-        self.field: dict[tuple[int, int], TileTexture] = {}
+        self.field: Mapping[tuple[int, int], TileTexture] = {}
+        self._field_revision: int = 0
         self.traffic_lights: dict[tuple[int, int], 'TrafficLight'] = {}
-        self.view_field: dict[tuple[int, int], Tile] = {}
+        self.registry: TrafficLightRegistry = game.pinger.registry
+        self.visible_tiles: VisibleTiles = VisibleTiles(())
+        self.tile_atlas: TileAtlas = TileAtlas(game, self.tile_size)
+        self.chunks: FieldChunks = FieldChunks(self)
 
         self.update_view()
 
@@ -39,9 +48,7 @@ class Field(Sprite):
         self.image.fill((32, 32, 32))
 
         self._update_tiles()
-        for pos in self.view_field.keys():
-            tile = self.view_field[pos]
-            self.image.blit(tile.image, self.get_offset_from_coordinates(pos))
+        self.chunks.draw(self.image, self.visible_tiles)
         self.update_traffic_light_view()
         if self.debug_view_mode:
             self._draw_zero_vectors()
@@ -59,14 +66,25 @@ class Field(Sprite):
             self.image.blit(traffic_light.image, self.get_offset_from_coordinates_for_traffic_light(pos, traffic_light))
             if not Path('check').is_dir() and traffic_light.data.note.get_level().value == 5:
                 continue
-            self.image.blit(traffic_light.data.note.get_cover((50, 50)),
+            self.image.blit(NoteIcon.get_cover_by_level((50, 50), traffic_light.data.note.get_level()),
                             self.get_offset_from_coordinates_for_traffic_lights_note(pos, traffic_light, (50, 50)))
 
     def can_build_traffic_light(self, pos: tuple[int, int]) -> bool:
         if pos not in self.field:
             return False
+        if isinstance(self.field, InfiniteMap):
+            return self.field.get_tile(pos) == TileTexture.ASPHALT
         return self.field[pos] == TileTexture.ASPHALT
 
+    def is_area_ready(self, first: tuple[int, int], last: tuple[int, int]) -> bool:
+        """Готова ли карта в прямоугольнике тайлов от first до last включительно.
+
+        Куски бесконечной карты генерируются в фоне, и до их готовности вместо тайлов возвращается заглушка.
+        """
+        if isinstance(self.field, InfiniteMap):
+            return self.field.is_area_ready(first, last)
+        return True
+
     def get_tile_position_by_coordinates(self, coord: tuple[int, int]) -> tuple[int, int]:
         """
         Получение координаты тайла на поле по координатам точки на экране
@@ -104,15 +122,27 @@ class Field(Sprite):
                                       540 - position_of_zero_tile_after[1])
         self.camera_offset = (self.camera_offset[0] + deviation[0], self.camera_offset[1] + deviation[1])
 
-        self.view_field = {}
         self.update_view()
 
     def get_camera_distance(self) -> float:
         return self._camera_distance
 
     def generate_field(self, seed: int | None = None, field_size: tuple[int, int] = (30, 30)):
-        self.view_field = {}
-        self.field = MapGenerator(field_size, seed).generate_map()
+        self.set_field(MapGenerator(field_size, seed).generate_map(), seed)
+
+    def set_field(self, field: Mapping[tuple[int, int], TileTexture], seed: int | None = None):
+        """Замена карты поля, например сгенерированной в фоне через MapLoader.
+
+        Args:
+            field: Карта
+            seed: Seed карты, от которого зависят цвета тайлов
+        """
+        if isinstance(self.field, InfiniteMap) and self.field is not field:
+            self.field.close()
+        self.chunks.clear()
+        self.tile_atlas.set_seed(seed if seed is not None else 0)
+        self.field = field
+        self._field_revision = field.revision if isinstance(field, InfiniteMap) else 0
 
     def get_offset_from_coordinates(self, coord: tuple[int, int]) -> tuple[int, int]:
         """
@@ -160,53 +190,10 @@ class Field(Sprite):
         Returns:
             Optional[tuple[int, int]]: Если светофор существует, то вернётся кортеж с координатами, иначе None.
         """
-        for coord, traffic_light in self.traffic_lights.items():
-            if traffic_light.data.uuid == uuid:
-                return coord
-        return None
-
-    def _get_number_of_initial_tiles(self) -> int:
-        updated_pos: list[tuple[int, int]] = []
-        coord = self._get_position_of_beginning_of_construction()
-
-        for delta_y in [1, -1]:
-            coord = (coord[0], self._get_position_of_beginning_of_construction()[1])
-            while not self._does_tile_extend_beyond_field(coord):
-                updated_pos.append(coord)
-                coord = (coord[0], coord[1] + delta_y)
-
-        return len(updated_pos)
+        return self.registry.get_pos(uuid)
 
     def _update_tiles(self):
-        updated_pos: list[tuple[int, int]] = []
-        coord: tuple[int, int] = self._get_position_of_beginning_of_construction()
-
-        for delta_y in [1, -1]:
-            coord = (coord[0], self._get_position_of_beginning_of_construction()[1])
-            while not self._does_tile_extend_beyond_field(coord):
-                updated_pos.append(coord)
-                coord = (self._get_position_of_beginning_of_construction()[0], coord[1])
-                for delta_x in [1, -1]:
-                    while not self._does_tile_extend_beyond_field(coord):
-                        coord = (coord[0] + delta_x, coord[1])
-                        updated_pos.append(coord)
-                    coord = (self._get_position_of_beginning_of_construction()[0], coord[1])
-                coord = (coord[0], coord[1] + delta_y)
-
-        updated_field: dict[tuple[int, int], Tile] = {}
-        for pos in updated_pos[:]:
-            if pos in self.view_field.keys():
-                updated_field[pos] = self.view_field[pos]
-            elif pos in self.field:
-                updated_field[pos] = Tile(self.game, self.tile_size,
-                                          self.pixel_size * self._camera_distance,
-                                          self.field[pos], self.perspective_angle)
-            else:
-                updated_field[pos] = Tile(self.game, self.tile_size,
-                                          self.pixel_size * self._camera_distance,
-                                          TileTexture.GRASS, self.perspective_angle)
-
-        self.view_field = updated_field
+        self.visible_tiles = VisibleTiles.from_view(self.camera_offset, self.get_half_of_tile_size())
 
     def _draw_zero_vectors(self):
         pg.draw.line(self.image, (255, 0, 0), (960, 540),
@@ -240,5 +227,21 @@ class Field(Sprite):
                     and self.get_offset_from_coordinates(coord)[0] + 2 * self.get_half_of_tile_size()[0] > 0 and
                     self.get_offset_from_coordinates(coord)[1] + 2 * self.get_half_of_tile_size()[1] > 0)
 
+    def _prefetch_field(self):
+        """Подготовка кусков бесконечной карты вокруг центра экрана.
+        """
+        half_ts: tuple[int, int] = self.get_half_of_tile_size()
+        across: float = (960 - self.camera_offset[0]) / max(1, half_ts[0])
+        along: float = (540 - self.camera_offset[1]) / max(1, half_ts[1])
+        center: tuple[int, int] = (round((across - along) / 2), round((across + along) / 2))
+        tiles_radius: float = (960 / max(1, half_ts[0]) + 540 / max(1, half_ts[1])) / 2
+        self.field.prefetch(center, ceil(tiles_radius / self.field.chunk_size))
+
     def update(self):
-        pass
+        if isinstance(self.field, InfiniteMap):
+            self._prefetch_field()
+            if self.field.revision != self._field_revision:
+                # Появились новые куски карты: тайлы на их месте были нарисованы заглушкой
+                self._field_revision = self.field.revision
+                self.update_view()
+        self.chunks.prerender()
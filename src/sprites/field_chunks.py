@@ -0,0 +1,154 @@
+from typing import TYPE_CHECKING, Iterable, Optional
+from collections import OrderedDict
+from time import perf_counter
+
+import pygame as pg
+
+from src.modules.tile_texture import TileTexture
+
+if TYPE_CHECKING:
+    from src.sprites import Field
+
+
+class FieldChunks:
+    """
+    Кэш заранее отрисованных кусков поля.
+    Поле делится на квадратные куски из нескольких тайлов, и каждый кусок отрисовывается на отдельное изображение
+    для текущего масштаба и угла перспективы. При движении камеры поле складывается из нескольких готовых кусков
+    вместо копирования каждого тайла.
+
+    Куски, которых ещё нет, отрисовываются постепенно: за кадр на это тратится не больше render_budget секунд,
+    а тайлы неготовых кусков копируются на поле напрямую. Оставшиеся куски дорисовываются в свободное время
+    кадра через prerender(). Кусок, карта которого ещё генерируется (Field.is_area_ready()), не отрисовывается
+    и не попадает в кэш.
+
+    Attributes:
+        chunk_pixels: Примерная ширина куска в пикселях
+        max_pixels: Сколько пикселей кусков хранить одновременно
+        render_budget: Время в секундах, которое можно тратить на отрисовку кусков за кадр
+    """
+
+    def __init__(self, field: 'Field', chunk_pixels: int = 512, max_pixels: int = 1920 * 1080 * 8,
+                 render_budget: float = 0.008):
+        self.field: 'Field' = field
+        self.chunk_pixels: int = chunk_pixels
+        self.max_pixels: int = max_pixels
+        self.render_budget: float = render_budget
+        self._chunks: OrderedDict[tuple[float, float, int, int], pg.Surface] = OrderedDict()
+        self._pixels: int = 0
+        self._visible_chunks: list[tuple[int, int]] = []
+
+    def draw(self, surface: pg.Surface, visible_tiles: Iterable[tuple[int, int]]):
+        """Отрисовка видимой части поля.
+
+        Args:
+            surface: Изображение, на котором рисуется поле
+            visible_tiles: Координаты тайлов, которые видны на экране
+        """
+        chunk_size: int = self.get_chunk_size()
+        tiles_by_chunk: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        for pos in visible_tiles:
+            tiles_by_chunk.setdefault((pos[0] // chunk_size, pos[1] // chunk_size), []).append(pos)
+        self._visible_chunks = list(tiles_by_chunk.keys())
+
+        deadline: float = perf_counter() + self.render_budget
+        blits: list[tuple[pg.Surface, tuple[int, int]]] = []
+        for chunk, tiles in tiles_by_chunk.items():
+            image: Optional[pg.Surface] = self._get(chunk, perf_counter() < deadline)
+            if image is not None:
+                blits.append((image, self._get_chunk_offset(chunk)))
+                continue
+            for pos in tiles:
+                blits.append((self._get_tile(pos), self.field.get_offset_from_coordinates(pos)))
+        surface.blits(blits, doreturn=False)
+
+    def prerender(self):
+        """Дорисовка кусков на экране и вокруг него, пока не истечёт бюджет кадра.
+        """
+        deadline: float = perf_counter() + self.render_budget
+        for chunk in self._visible_chunks:
+            if perf_counter() >= deadline:
+                return
+            self._get(chunk, True)
+        for chunk in self._visible_chunks:
+            for neighbour in ((chunk[0] + 1, chunk[1]), (chunk[0] - 1, chunk[1]),
+                              (chunk[0], chunk[1] + 1), (chunk[0], chunk[1] - 1)):
+                if perf_counter() >= deadline:
+                    return
+                self._get(neighbour, True)
+
+    def get_ready_part(self) -> float:
+        """Получение доли уже отрисованных кусков среди видимых на экране.
+        """
+        if not self._visible_chunks:
+            return 1.
+        ready: int = sum(1 for chunk in self._visible_chunks if self._get_key(chunk) in self._chunks)
+        return ready / len(self._visible_chunks)
+
+    def get_chunk_size(self) -> int:
+        """Получение размера куска в тайлах для текущего масштаба.
+        """
+        return max(1, self.chunk_pixels // (2 * max(1, self.field.get_half_of_tile_size()[0])))
+
+    def clear(self):
+        self._chunks = OrderedDict()
+        self._pixels = 0
+        self._visible_chunks = []
+
+    def _get_key(self, chunk: tuple[int, int]) -> tuple[float, float, int, int]:
+        return (round(self.field.pixel_size * self.field.get_camera_distance(), 3),
+                round(self.field.perspective_angle, 3), chunk[0], chunk[1])
+
+    def _get(self, chunk: tuple[int, int], render: bool) -> Optional[pg.Surface]:
+        key: tuple[float, float, int, int] = self._get_key(chunk)
+        image: Optional[pg.Surface] = self._chunks.get(key)
+        if image is not None:
+            self._chunks.move_to_end(key)
+            return image
+        if not render:
+            return None
+        chunk_size: int = self.get_chunk_size()
+        if not self.field.is_area_ready((chunk[0] * chunk_size, chunk[1] * chunk_size),
+                                        ((chunk[0] + 1) * chunk_size - 1, (chunk[1] + 1) * chunk_size - 1)):
+            return None
+
+        image = self._render(chunk)
+        self._chunks[key] = image
+        self._pixels += image.get_width() * image.get_height()
+        while self._pixels > self.max_pixels and len(self._chunks) > 1:
+            _, evicted = self._chunks.popitem(last=False)
+            self._pixels -= evicted.get_width() * evicted.get_height()
+        return image
+
+    def _render(self, chunk: tuple[int, int]) -> pg.Surface:
+        half_ts: tuple[int, int] = self.field.get_half_of_tile_size()
+        chunk_size: int = self.get_chunk_size()
+        origin: tuple[int, int] = self._get_chunk_origin(chunk)
+
+        image: pg.Surface = pg.Surface((2 * chunk_size * half_ts[0] + 2, 2 * chunk_size * half_ts[1] + 2),
+                                       pg.SRCALPHA, 32).convert_alpha()
+        blits: list[tuple[pg.Surface, tuple[int, int]]] = []
+        for x in range(chunk[0] * chunk_size, (chunk[0] + 1) * chunk_size):
+            for y in range(chunk[1] * chunk_size, (chunk[1] + 1) * chunk_size):
+                blits.append((self._get_tile((x, y)),
+                              (half_ts[0] * (x + y) - origin[0], half_ts[1] * (y - x) - origin[1])))
+        image.blits(blits, doreturn=False)
+        return image
+
+    def _get_tile(self, pos: tuple[int, int]) -> pg.Surface:
+        return self.field.tile_atlas.get(self.field.field.get(pos, TileTexture.GRASS),
+                                         self.field.pixel_size * self.field.get_camera_distance(),
+                                         self.field.perspective_angle,
+                                         self.field.tile_atlas.get_variant_by_position(pos))
+
+    def _get_chunk_origin(self, chunk: tuple[int, int]) -> tuple[int, int]:
+        """Координаты левого верхнего угла куска без учёта смещения камеры.
+        """
+        half_ts: tuple[int, int] = self.field.get_half_of_tile_size()
+        chunk_size: int = self.get_chunk_size()
+        x, y = chunk[0] * chunk_size, chunk[1] * chunk_size
+        return half_ts[0] * (x + y), half_ts[1] * (y - x - chunk_size + 1)
+
+    def _get_chunk_offset(self, chunk: tuple[int, int]) -> tuple[int, int]:
+        origin: tuple[int, int] = self._get_chunk_origin(chunk)
+        return self.field.camera_offset[0] + origin[0], self.field.camera_offset[1] + origin[1]
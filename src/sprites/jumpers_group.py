@@ -1,6 +1,5 @@
 from typing import TYPE_CHECKING
 import pygame as pg
-from pygame import SRCALPHA
 from math import sqrt
 
 from src.sprite import Sprite
@@ -14,18 +13,25 @@ class JumpersGroup(Sprite):
     def __init__(self, game: 'Game'):
         super().__init__(game, (1920, 1080))
         self.jumpers: list['Jumper'] = []
+        self._drawn_rects: list[pg.Rect] = []
 
     def update_view(self):
-        self.image = pg.Surface((1920, 1080), SRCALPHA, 32).convert_alpha()
+        self.mark_unchanged()
+        for rect in self._drawn_rects:
+            self.image.fill((0, 0, 0, 0), rect)
+            self.mark_dirty(rect)
+        self._drawn_rects = []
         for jumper in self.jumpers:
             jumper.update_view()
-            self.image.blit(jumper.image, jumper.rect)
+            rect: pg.Rect = self.image.blit(jumper.image, jumper.rect)
+            self._drawn_rects.append(rect)
+            self.mark_dirty(rect)
 
     def add_jumper(self, jumper: 'Jumper'):
         self.jumpers.append(jumper)
 
     def update(self):
-        if len(self.jumpers) > 0:
+        if len(self.jumpers) > 0 or len(self._drawn_rects) > 0:
             self.jumpers = list(filter(
                 lambda j: j.index < sqrt(2),
                 self.jumpers
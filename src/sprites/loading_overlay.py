@@ -0,0 +1,56 @@
+from typing import TYPE_CHECKING
+import pygame as pg
+
+from src.sprites import Text
+from src.sprite import Sprite
+
+if TYPE_CHECKING:
+    from src.game import Game
+
+
+class LoadingOverlay(Sprite):
+    """Экран загрузки с названием текущего этапа и полосой прогресса.
+
+    Пока cover включён, overlay закрывает весь экран, иначе отображается только панель
+    с прогрессом внизу экрана, а остальная сцена остаётся видна.
+    """
+
+    def __init__(self, game: 'Game'):
+        super().__init__(game, (1920, 1080), (0, 0))
+        self.stage: str = ''
+        self.progress: float = 0
+        self.cover: bool = True
+
+        self.update_view()
+
+    def set_progress(self, stage: str, progress: float, cover: bool = True):
+        """Обновление этапа загрузки.
+
+        Args:
+            stage: Название этапа
+            progress: Общий прогресс загрузки от 0 до 1
+            cover: Закрывать ли всю сцену
+        """
+        progress = min(1., max(0., progress))
+        if (stage, round(progress * 100), cover) == (self.stage, round(self.progress * 100), self.cover):
+            return
+        self.stage, self.progress, self.cover = stage, progress, cover
+        self.update_view()
+
+    def update_view(self):
+        self.image.fill((32, 32, 32, 255) if self.cover else (0, 0, 0, 0))
+
+        panel: pg.Rect = pg.Rect(660, 480, 600, 120) if self.cover else pg.Rect(660, 840, 600, 120)
+        pg.draw.rect(self.image, (32, 32, 32), panel)
+        pg.draw.rect(self.image, (78, 78, 78), panel, 3)
+
+        text: Text = Text(self.game, (panel.centerx, panel.y + 35), f'{self.stage} ({round(self.progress * 100)}%)',
+                          16, (255, 255, 255))
+        self.image.blit(text.image, text.rect)
+
+        bar: pg.Rect = pg.Rect(panel.x + 20, panel.y + 70, panel.width - 40, 30)
+        pg.draw.rect(self.image, (58, 58, 58), pg.Rect(bar.x, bar.y, round(bar.width * self.progress), bar.height))
+        pg.draw.rect(self.image, (78, 78, 78), bar, 3)
+
+    def update(self):
+        pass
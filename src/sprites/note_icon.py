@@ -0,0 +1,76 @@
+from typing import Optional
+from os import path
+from math import ceil
+
+import pygame as pg
+from pygame import SRCALPHA
+
+from src.sprites.pixelart import Pixelart
+from src.modules.traffic_light_data import NoteType
+
+
+class NoteIcon:
+    """
+    Атлас иконок записок светофора.
+    PNG-файлы иконок декодируются один раз, а отрисованные иконки хранятся по ключу (тип записки, размер),
+    поэтому получение иконки сводится к поиску в словаре. Полученные иконки нельзя изменять.
+    """
+    paths: dict[NoteType, str] = {
+        NoteType.EXCLAMATION_ERROR: path.join('assets', 'images', 'exclamation_error.png'),
+        NoteType.WAIT_MARK: path.join('assets', 'images', 'wait_mark.png'),
+        NoteType.CLOUD_ERROR: path.join('assets', 'images', 'cloud_error.png'),
+        NoteType.QUESTION_ERROR: path.join('assets', 'images', 'question_error.png'),
+        NoteType.QUESTION_WARNING: path.join('assets', 'images', 'question_warning.png'),
+        NoteType.OK: path.join('assets', 'images', 'ok_mark.png'),
+    }
+    _pixelarts: dict[NoteType, tuple[tuple[tuple[int, int, int, int], ...]]] = {}
+    _covers: dict[tuple[NoteType, tuple[int, int]], pg.Surface] = {}
+    _empty: Optional[pg.Surface] = None
+
+    @classmethod
+    def preload(cls, sizes: tuple[tuple[int, int], ...] = ((50, 50), (100, 100))):
+        """Декодирование всех иконок и отрисовка их в часто используемых размерах.
+
+        Args:
+            sizes: Размеры иконок, которые нужно отрисовать заранее
+        """
+        for level in NoteType:
+            for size in sizes:
+                cls.get_cover_by_level(size, level)
+
+    @classmethod
+    def get_cover_by_level(cls, size: tuple[int, int], icon_level: Optional[NoteType | int]) -> pg.Surface:
+        """Получение иконки записки.
+
+        Args:
+            size: Размер иконки в пикселях
+            icon_level: Уровень записки для светофора
+        """
+        if icon_level is None:
+            if cls._empty is None:
+                cls._empty = pg.Surface((0, 0))
+            return cls._empty
+
+        key: tuple[NoteType, tuple[int, int]] = (NoteType(icon_level), (int(size[0]), int(size[1])))
+        cover: Optional[pg.Surface] = cls._covers.get(key)
+        if cover is None:
+            cover = cls._draw_cover(*key)
+            cls._covers[key] = cover
+        return cover
+
+    @classmethod
+    def _draw_cover(cls, level: NoteType, size: tuple[int, int]) -> pg.Surface:
+        pixel_size: tuple[float, float] = (size[0] / 16, size[1] / 16)
+
+        surface: pg.Surface = pg.Surface(size, SRCALPHA, 32).convert_alpha()
+
+        if level not in cls._pixelarts:
+            cls._pixelarts[level] = Pixelart.get_pixelart_by_image(cls.paths[level])
+        pixelart = cls._pixelarts[level]
+        for y in range(len(pixelart)):
+            for x in range(len(pixelart[y])):
+                pg.draw.rect(surface, pixelart[y][x], pg.Rect(
+                    pixel_size[0] * x, pixel_size[1] * y, ceil(pixel_size[0]), ceil(pixel_size[1])
+                ))
+
+        return surface
@@ -1,73 +1,25 @@
-from typing import TYPE_CHECKING, Self
-from enum import Enum
-import random
+from typing import TYPE_CHECKING, Optional
 from math import sin, cos
+import random
 
 import pygame as pg
 
 from src.sprite import Sprite
+from src.modules.tile_texture import TileTexture
 
 if TYPE_CHECKING:
     from src.game import Game
 
 
-class TileTexture(Enum):
-    GRASS = 0
-    STONE = 1
-    SAND = 2
-    WATER = 3
-    ASPHALT = 4
-
-    @classmethod
-    def get_one_of_colors(cls, texture: Self) -> tuple[int, int, int]:
-        colors: dict[Self, list[tuple[int, int, int]]] = {
-            TileTexture.GRASS: [
-                (58, 140, 62),
-                (94, 124, 22),
-                (102, 162, 24),
-                (58, 109, 53)
-            ],
-            TileTexture.STONE: [
-                (90, 90, 90),
-                (120, 120, 120),
-                (60, 60, 60),
-                (150, 150, 150)
-            ],
-            TileTexture.SAND: [
-                (180, 165, 140),
-                (160, 145, 120),
-                (140, 125, 100),
-                (120, 105, 80)
-            ],
-            TileTexture.WATER: [
-                (100, 210, 220),
-                (0, 150, 170),
-                (70, 200, 200),
-                (0, 105, 120)
-            ],
-            TileTexture.ASPHALT: [
-                (50, 50, 50),
-                (60, 55, 50),
-                (30, 30, 30),
-                (70, 65, 60)
-            ]
-        }
-        color = random.choice(colors[texture])
-        return (
-            min(255, max(0, color[0] + random.randint(-10, 10))),
-            min(255, max(0, color[1] + random.randint(-10, 10))),
-            min(255, max(0, color[2] + random.randint(-10, 10)))
-        )
-
-
 class Tile(Sprite):
     """
     Клетка на поле
-    Представляет собой ромб с углами _perspective_angle * 2 и (360 - _perspective_angle * 4) / 2
+    Представляет собой ромб с углами _perspective_angle * 2 и (360 - _perspective_angle * 4) / 2.
+    Цвета пикселей берутся из rng, поэтому тайл с одинаково засеянным генератором выглядит одинаково
     """
 
     def __init__(self, game: 'Game', size: int, pixel_size: float,
-                 texture: TileTexture, perspective_angle: float):
+                 texture: TileTexture, perspective_angle: float, rng: Optional[random.Random] = None):
         super().__init__(game, (round(2 * size * pixel_size * cos(perspective_angle)),
                                 round(2 * size * pixel_size * sin(perspective_angle))),
                          (0, 0))
@@ -75,6 +27,7 @@ class Tile(Sprite):
         self.perspective_angle = perspective_angle
         self.pixel_size: float = pixel_size
         self.texture: TileTexture = texture
+        self.rng: Optional[random.Random] = rng
 
         self.update_view()
 
@@ -89,7 +42,7 @@ class Tile(Sprite):
             self.pixel_size * sin(self.perspective_angle) * (coord[1] - coord[0])
             + self.size * self.pixel_size * sin(self.perspective_angle)
         )
-        pg.draw.polygon(self.image, TileTexture.get_one_of_colors(self.texture), [
+        pg.draw.polygon(self.image, TileTexture.get_one_of_colors(self.texture, self.rng), [
             [start[0], start[1]],
             [start[0] + self.pixel_size * cos(self.perspective_angle),
              start[1] - self.pixel_size * sin(self.perspective_angle)],
@@ -0,0 +1,71 @@
+from typing import TYPE_CHECKING
+import random
+
+import pygame as pg
+
+from src.sprites.tile import Tile, TileTexture
+
+if TYPE_CHECKING:
+    from src.game import Game
+
+
+class TileAtlas:
+    """
+    Атлас заранее отрисованных тайлов.
+    Для каждой текстуры хранится несколько вариантов тайла на каждый масштаб и угол перспективы,
+    поэтому поле копирует готовые изображения вместо отрисовки каждого тайла по пикселям.
+
+    Цвета вариантов и выбор варианта для позиции зависят только от seed города, поэтому
+    карта выглядит одинаково при любом масштабе и при каждом открытии города.
+
+    Attributes:
+        seed: Seed города
+        variants: Количество вариантов тайла одной текстуры
+        max_keys: Сколько сочетаний (текстура, размер пикселя, угол) хранить одновременно
+    """
+
+    def __init__(self, game: 'Game', tile_size: int, variants: int = 8, max_keys: int = 64, seed: int = 0):
+        self.game: 'Game' = game
+        self.seed: int = seed
+        self.tile_size: int = tile_size
+        self.variants: int = variants
+        self.max_keys: int = max_keys
+        self._tiles: dict[tuple[TileTexture, float, float], tuple[pg.Surface, ...]] = {}
+
+    def get(self, texture: TileTexture, pixel_size: float, perspective_angle: float, variant: int) -> pg.Surface:
+        """Получение изображения тайла.
+
+        Args:
+            texture: Текстура тайла
+            pixel_size: Размер пикселя тайла с учётом отдаления камеры
+            perspective_angle: Угол перспективы
+            variant: Номер варианта тайла. Берётся по модулю количества вариантов
+        """
+        key: tuple[TileTexture, float, float] = (texture, round(pixel_size, 3), round(perspective_angle, 3))
+        tiles = self._tiles.get(key)
+        if tiles is None:
+            if len(self._tiles) >= self.max_keys:
+                del self._tiles[next(iter(self._tiles))]
+            tiles = tuple(Tile(self.game, self.tile_size, pixel_size, texture, perspective_angle,
+                               random.Random(f'{self.seed}:{texture.name}:{variant}')).image
+                          for variant in range(self.variants))
+            self._tiles[key] = tiles
+        return tiles[variant % self.variants]
+
+    def set_seed(self, seed: int):
+        """Смена seed города. Отрисованные тайлы при этом сбрасываются.
+        """
+        if seed != self.seed:
+            self.seed = seed
+            self.clear()
+
+    def get_variant_by_position(self, pos: tuple[int, int]) -> int:
+        """Получение номера варианта тайла по его координатам на поле.
+        Номер не зависит от порядка отрисовки, поэтому тайл не меняет вид при движении камеры.
+        """
+        value: int = (pos[0] * 0x9E3779B1 + pos[1] * 0x85EBCA77 + self.seed * 0xC2B2AE3D) & 0xFFFFFFFF
+        value = ((value ^ (value >> 15)) * 0x2C1B3C6D) & 0xFFFFFFFF
+        return value ^ (value >> 12)
+
+    def clear(self):
+        self._tiles = {}
@@ -15,11 +15,20 @@ class TileSelection(Sprite):
         self.func: Callable[[tuple[int, int]], None] | None = func
         self._visible: bool = False
         self.limits: pg.Rect = pg.Rect(30, 30, 1860, 910)
+        self._selection_rect: Optional[pg.Rect] = None
+        self._border_drawn: bool = False
 
     def update_view(self):
-        self.image = pg.Surface((1920, 1080), pg.SRCALPHA, 32).convert_alpha()
+        self.mark_unchanged()
+        if self._selection_rect is not None:
+            self.image.fill((0, 0, 0, 0), self._selection_rect)
+            self.mark_dirty(self._selection_rect)
+            self._selection_rect = None
 
-        pg.draw.rect(self.image, (128, 128, 128), self.limits, 3)
+        if not self._border_drawn:
+            pg.draw.rect(self.image, (128, 128, 128), self.limits, 3)
+            self._border_drawn = True
+            self.mark_dirty()
 
         if not self.limits.collidepoint(pg.mouse.get_pos()[0], pg.mouse.get_pos()[1]):
             return
@@ -27,13 +36,16 @@ class TileSelection(Sprite):
         coord: tuple[int, int] = self.field.get_offset_from_coordinates(self.get_coord())
         polygon: list[tuple[int, int]] = list(
             map(lambda pos: (pos[0] + coord[0], pos[1] + coord[1]), self.field.get_tile_as_polygon()))
-        pg.draw.polygon(self.image, (255, 255, 255), polygon, 3)
+        self._selection_rect = pg.draw.polygon(self.image, (255, 255, 255), polygon, 3).inflate(2, 2)
+        self.mark_dirty(self._selection_rect)
 
     def is_visible(self) -> bool:
         return self._visible
 
     def set_visible(self, visible: bool):
         self.image = pg.Surface((1920, 1080), pg.SRCALPHA, 32).convert_alpha()
+        self._selection_rect = None
+        self._border_drawn = False
         self._visible = visible
 
     def get_coord(self) -> Optional[tuple[int, int]]:
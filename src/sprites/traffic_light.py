@@ -1,4 +1,5 @@
 from typing import TYPE_CHECKING, Optional, Sequence
+from math import ceil
 
 import pygame as pg
 from pygame import SRCALPHA
@@ -17,7 +18,14 @@ class TrafficLight(Sprite):
     """
     Основной класс светофора.
     Может быть добавлен на карту города, или на панель.
+
+    Изображения светофоров общие для всех экземпляров: одинаковые светофоры в одном состоянии
+    при одном масштабе поля отрисовываются один раз, после чего берутся из кэша.
+    Полученные изображения нельзя изменять.
     """
+    _view_cache: dict[tuple[str, int, tuple[int, int]], pg.Surface] = {}
+    _cover_cache: dict[tuple[str, int, int, int | None], pg.Surface] = {}
+    max_cache_size: int = 512
 
     def __init__(self, game: 'Game', tfl_type: str, uuid: Optional[str] = None,
                  field: Optional['Field'] = None):
@@ -32,6 +40,12 @@ class TrafficLight(Sprite):
         if self.field is None:
             return
         half_ts = self.field.get_half_of_tile_size()
+        key: tuple[str, int, tuple[int, int]] = (self.data.tfl_type, self.data.get_state(), half_ts)
+        cached: Optional[pg.Surface] = TrafficLight._view_cache.get(key)
+        if cached is not None:
+            self.image = cached
+            return
+
         self.image = pg.Surface((
             half_ts[0] * .25 + 5 + (self.data.get_size()[0] - 1) * half_ts[0] * .25,
             half_ts[1] * .75 + 5 + (self.data.get_size()[1] - 1) * half_ts[1] * .5
@@ -40,8 +54,10 @@ class TrafficLight(Sprite):
 
         for segment in self.data.segments.values():
             self._draw_substrate(segment)
-        for segment in self.data.segments.values():
-            self._draw_appearance(segment)
+        for name, segment in self.data.segments.items():
+            self._draw_appearance(segment, self.data.get_segment_value(name))
+
+        TrafficLight._put_to_cache(TrafficLight._view_cache, key, self.image)
 
     def _draw_substrate(self, segment: TrafficLightSegment):
         half_ts = self.field.get_half_of_tile_size()
@@ -59,7 +75,7 @@ class TrafficLight(Sprite):
         pg.draw.polygon(self.image, (0, 0, 0), displaced_back)
         pg.draw.polygon(self.image, (0, 0, 0), displaced_back, 3)
 
-    def _draw_appearance(self, segment: TrafficLightSegment):
+    def _draw_appearance(self, segment: TrafficLightSegment, value: str):
         half_ts = self.field.get_half_of_tile_size()
         displaced_font: Sequence[tuple[float, float]] = list(
             map(lambda p: (
@@ -73,11 +89,11 @@ class TrafficLight(Sprite):
                 ]))
 
         pg.draw.polygon(self.image, (128, 128, 128), displaced_font)
-        self._draw_appearance_pixelart(segment)
+        self._draw_appearance_pixelart(segment, value)
         pg.draw.polygon(self.image, (0, 0, 0), displaced_font, 3)
 
-    def _draw_appearance_pixelart(self, segment: TrafficLightSegment):
-        pixelart: tuple[tuple[tuple[int, int, int, int], ...]] = segment.get_pixelart_by_value(segment.value)
+    def _draw_appearance_pixelart(self, segment: TrafficLightSegment, value: str):
+        pixelart: tuple[tuple[tuple[int, int, int, int], ...]] = segment.get_pixelart_by_value(value)
         half_ts = self.field.get_half_of_tile_size()
 
         for y, row in enumerate(pixelart):
@@ -105,6 +121,11 @@ class TrafficLight(Sprite):
         Returns:
             Изображение со светофором заданной высоты
         """
+        key: tuple[str, int, int, int | None] = (self.data.tfl_type, self.data.get_state(), height, wight)
+        cached: Optional[pg.Surface] = TrafficLight._cover_cache.get(key)
+        if cached is not None:
+            return cached
+
         space: int = round(height / self.data.get_size()[1] * 0.1)
         segment_size: int = round(height / self.data.get_size()[1]) - space
 
@@ -115,13 +136,44 @@ class TrafficLight(Sprite):
 
         offset_for_centering: int = (wight - round(
             space + (segment_size + space) * self.data.get_size()[0])) // 2 if wight else 0
-        for segment in self.data.segments.values():
-            segment_image = segment.get_image_by_value(segment.value, segment_size)
+        for name, segment in self.data.segments.items():
+            segment_image = self.get_segment_image(segment, self.data.get_segment_value(name), segment_size)
             surface.blit(segment_image,
                          (offset_for_centering + space + segment_size * segment.pos[0] + space * segment.pos[0],
                           space + segment_size * segment.pos[1] + space * segment.pos[1]))
 
+        TrafficLight._put_to_cache(TrafficLight._cover_cache, key, surface)
         return surface
 
+    @classmethod
+    def clear_cache(cls):
+        """Очистка кэша изображений. Нужна после изменения текстур.
+        """
+        cls._view_cache.clear()
+        cls._cover_cache.clear()
+
+    @classmethod
+    def _put_to_cache(cls, cache: dict, key: tuple, surface: pg.Surface):
+        if len(cache) >= cls.max_cache_size:
+            del cache[next(iter(cache))]
+        cache[key] = surface
+
+    @staticmethod
+    def get_segment_image(segment: TrafficLightSegment, value: str, size: int) -> pg.Surface:
+        """
+        Получение изображения секции светофора. Гарантируется, что изображение будет квадратным
+        """
+        image: pg.Surface = pg.Surface((size, size), SRCALPHA, 32).convert_alpha()
+        pixel_size: float = size / 16
+
+        pixelart: tuple[tuple[tuple[int, int, int, int], ...]] = segment.get_pixelart_by_value(value)
+        for row in range(len(pixelart)):
+            for pixel in range(len(pixelart)):
+                pg.draw.rect(image, pixelart[row][pixel], pg.Rect(
+                    pixel * pixel_size, row * pixel_size, ceil(pixel_size), ceil(pixel_size)
+                ))
+
+        return image
+
     def update(self):
         pass
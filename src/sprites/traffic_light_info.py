@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING, Optional
 import pygame as pg
 from pygame import SRCALPHA
 
-from src.sprites import Text, TextAlign
+from src.sprites import Text, TextAlign, NoteIcon
 from src.sprite import Sprite
 
 if TYPE_CHECKING:
@@ -35,7 +35,7 @@ class TrafficLightInfo(Sprite):
         ))
 
         note_level: int = 0 if self.data.note.get_level() is None else self.data.note.get_level()
-        self.image.blit(self.data.note.get_cover_by_level((100, 100), note_level), (150, 30))
+        self.image.blit(NoteIcon.get_cover_by_level((100, 100), note_level), (150, 30))
 
         uuid_text = Text(self.game, (200, 155), self.data.uuid, 16, (255, 255, 255))
         self.image.blit(uuid_text.image, uuid_text.rect)
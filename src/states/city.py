@@ -1,18 +1,20 @@
 """Модуль сцены города.
 """
 import json
+import logging
 from typing import TYPE_CHECKING, Optional, Callable
+from collections import deque
 from math import pi
+from time import perf_counter
 import pygame as pg
 from random import randint, choice, uniform
-import time
 from os import path
 
 from src.state import State
 
 from src.sprites import Field, TrafficLight, Button, InBlockText, ButtonStatus, TileSelection, \
-    TrafficLightInfo, CityInfo, JumpersGroup, Jumper, Pixelart
-from src.modules import TrafficLightData
+    TrafficLightInfo, CityInfo, JumpersGroup, Jumper, Pixelart, LoadingOverlay
+from src.modules import TrafficLightData, MapLoader
 
 if TYPE_CHECKING:
     from src.game import Game
@@ -26,12 +28,26 @@ class SelectorType:
     REMOVE = 2
 
 
+class LoadingStage:
+    """Этапы загрузки города.
+    """
+    GENERATE = 0
+    PRERENDER = 1
+    PLACE_TRAFFIC_LIGHTS = 2
+
+
 class City(State):
     """Сцена города.
 
+    Город загружается по этапам: карта генерируется в фоновом потоке, затем видимая часть поля
+    отрисовывается и расставляются сохранённые светофоры. Этапы выполняются понемногу каждый кадр,
+    а их прогресс показывается на LoadingOverlay, поэтому окно не зависает на больших картах.
+
     Attributes:
         selected_type_of_selector: При нажатии на кнопку строительства
             светофора здесь, сохраняется информация о выбранном для строительства светофоре.
+        loading_stage: Текущий этап загрузки города или None, если город загружен.
+        loading_budget: Время в секундах, которое можно тратить на расстановку светофоров за кадр.
     """
 
     def __init__(self, game: 'Game'):
@@ -45,7 +61,12 @@ class City(State):
         self.name: str = ''
         self.deaths: int = 0
         self.seed: int = 0
-        self.size: tuple[int, int] = (0, 0)
+        self.size: Optional[tuple[int, int]] = (0, 0)
+        self.loading_stage: Optional[LoadingStage | int] = None
+        self.loading_budget: float = 0.01
+        self._map_loader: Optional[MapLoader] = None
+        self._pending_traffic_lights: deque[tuple[tuple[int, int], str]] = deque()
+        self._traffic_lights_to_place: int = 0
 
     def boot(self):
         """Инициализация сцены.
@@ -69,20 +90,88 @@ class City(State):
     def update(self):
         """Обновление сцены.
 
-        Реализация передвижения и ежесекундный пинг.
+        Реализация передвижения и разбор результатов ежесекундного пинга.
+        Пока город загружается, выполняется только очередной этап загрузки.
         """
+        if self.loading_stage is not None:
+            self.loading()
+            return
+
         self.movement()
         self.pinging()
 
+    def loading(self):
+        """Выполнение текущего этапа загрузки города.
+        """
+        field: Field = self.get_sprite('field')
+        loading_overlay: LoadingOverlay = self.get_sprite('loading_overlay')
+
+        if self.loading_stage == LoadingStage.GENERATE:
+            loading_overlay.set_progress('Генерация карты', 0)
+            if not self._map_loader.is_done():
+                return
+            try:
+                field.set_field(self._map_loader.get_result(), self.seed)
+            except Exception:
+                logging.exception('Не удалось загрузить город "%s"', self.name)
+                self.loading_stage = None
+                self.game.change_state('Menu')
+                return
+            self._map_loader = None
+            field.update_view()
+            self.loading_stage = LoadingStage.PRERENDER
+
+        if self.loading_stage == LoadingStage.PRERENDER:
+            ready: float = field.chunks.get_ready_part()
+            loading_overlay.set_progress('Отрисовка карты', (1 + ready) / 3)
+            if ready < 1:
+                return
+            field.update_view()
+            self.loading_stage = LoadingStage.PLACE_TRAFFIC_LIGHTS
+
+        if self.loading_stage == LoadingStage.PLACE_TRAFFIC_LIGHTS:
+            deadline: float = perf_counter() + self.loading_budget
+            while self._pending_traffic_lights and perf_counter() < deadline:
+                pos, tfl_type = self._pending_traffic_lights.popleft()
+                self.build_traffic_light(pos, tfl_type, redraw=False)
+            field.update_view()
+
+            placed: int = self._traffic_lights_to_place - len(self._pending_traffic_lights)
+            loading_overlay.set_progress('Расстановка светофоров',
+                                         (2 + placed / max(1, self._traffic_lights_to_place)) / 3, cover=False)
+            if self._pending_traffic_lights:
+                return
+            self.remove_sprite('loading_overlay')
+            self.loading_stage = None
+            logging.info('Город "%s" загружен', self.name)
+
+    def finish_loading(self):
+        """Загрузка города целиком без ожидания следующих кадров.
+        """
+        field: Field = self.get_sprite('field')
+        while self.loading_stage is not None:
+            if self.loading_stage == LoadingStage.GENERATE:
+                self._map_loader.get_result()
+            elif self.loading_stage == LoadingStage.PRERENDER:
+                field.chunks.prerender()
+            self.loading()
+
+    def is_loading(self) -> bool:
+        return self.loading_stage is not None
+
     def pinging(self):
-        """Пинг каждую секунду.
+        """Разбор результатов фонового пинга, накопившихся с прошлого кадра.
         """
-        if time.time() - self.game.last_ping_time >= 1 and self.game.pinger.running:
-            jumpers_group: 'JumpersGroup' = self.get_sprite('jumpers_group')
-            city_info: 'CityInfo' = self.get_sprite('city_info')
-            field: Field = self.get_sprite('field')
+        results: list[dict[str, Optional[tuple[bool, str, int]]]] = self.game.ping_scheduler.drain()
+        if not results:
+            return
+
+        jumpers_group: 'JumpersGroup' = self.get_sprite('jumpers_group')
+        city_info: 'CityInfo' = self.get_sprite('city_info')
+        field: Field = self.get_sprite('field')
 
-            for uuid, result in self.game.pinger.ping().items():
+        for ping_results in results:
+            for uuid, result in ping_results.items():
                 if result is not None and not result[0]:
                     pos: Optional[tuple[int, int]] = field.get_traffic_light_pos_by_uuid(uuid)
                     if pos is None:
@@ -100,11 +189,10 @@ class City(State):
                                ))
                     )
                     self.deaths += 1
-            city_info.update_info(self.deaths)
-            city_info.update_view()
-            self.game.last_ping_time = time.time()
+        city_info.update_info(self.deaths)
+        city_info.update_view()
 
-            field.update_view()
+        field.update_view()
 
     def add_construction_management_elements_buttons(self):
         """Добавление кнопок, отвечающих за строительство.
@@ -141,10 +229,11 @@ class City(State):
                                    placeholder=traffic_lights[i].get_cover))
 
     def enter(self):
-        """Передача сида и размера карты при заходе.
+        """Передача сида и размера карты при заходе и запуск загрузки города.
         """
         self.name = str(self.game.transmitted_data['name'])
-        self.size = tuple[int, int](self.game.transmitted_data['size'])
+        size: Optional[list[int]] = self.game.transmitted_data['size']
+        self.size = tuple[int, int](size) if size is not None else None
         self.deaths = int(self.game.transmitted_data['deaths'])
         self.seed = self.game.transmitted_data['seed']
 
@@ -152,13 +241,24 @@ class City(State):
             self.seed = randint(0, 9999999999)
 
         field: Field = self.get_sprite('field')
-        field.generate_field(self.seed, self.size)
-        field.update_view()
+        field.set_field({}, self.seed)
+        field.traffic_lights = {}
+        field.registry.clear()
+        self.game.ping_scheduler.clear()
         self.game.pinger.running = True
 
-        for tfl_type in self.game.transmitted_data['traffic_lights']:
-            for pos in self.game.transmitted_data['traffic_lights'][tfl_type]:
-                self.build_traffic_light(tuple[int, int](pos), tfl_type)
+        self._pending_traffic_lights = deque(
+            (tuple[int, int](pos), tfl_type)
+            for tfl_type in self.game.transmitted_data['traffic_lights']
+            for pos in self.game.transmitted_data['traffic_lights'][tfl_type])
+        self._traffic_lights_to_place = len(self._pending_traffic_lights)
+
+        self._map_loader = MapLoader(self.size, self.seed)
+        self._map_loader.start()
+        self.loading_stage = LoadingStage.GENERATE
+        if 'loading_overlay' in self.sprites:
+            self.remove_sprite('loading_overlay')
+        self.add_sprite('loading_overlay', LoadingOverlay(self.game))
 
         city_info: CityInfo = self.get_sprite('city_info')
         city_info.city_name = self.name
@@ -194,7 +294,7 @@ class City(State):
             tile_selection.set_visible(True)
 
     def on_save_city_button_pressed(self, status: ButtonStatus):
-        if status != ButtonStatus.PRESSED:
+        if status != ButtonStatus.PRESSED or self.is_loading():
             return
 
         field: Field = self.get_sprite('field')
@@ -206,15 +306,15 @@ class City(State):
             'traffic_lights': {}
         }
         for tfl_type in TrafficLightData.get_all_types():
-            city['traffic_lights'][tfl_type] = []
-            for pos, traffic_light in field.traffic_lights.items():
-                if traffic_light.data.tfl_type == tfl_type:
-                    city['traffic_lights'][tfl_type].append(pos)
+            city['traffic_lights'][tfl_type] = [field.registry.get_pos(data.uuid)
+                                                for data in field.registry.get_by_type(tfl_type)]
 
         with open(path.join('saves', 'cities', f'{self.name}.json'), 'w') as file:
             file.write(json.dumps(city))
 
     def apply_selector(self, pos: tuple[int, int]):
+        if self.is_loading():
+            return
         actions: dict[int, Callable[[tuple[int, int]], None]] = {
             SelectorType.BUILD: self.build_traffic_light_by_selector,
             SelectorType.GET_INFO: self.show_traffic_light_info,
@@ -244,7 +344,14 @@ class City(State):
         """
         self.build_traffic_light(pos, self.selected_type_of_selector[1])
 
-    def build_traffic_light(self, pos: tuple[int, int], tfl_type: str):
+    def build_traffic_light(self, pos: tuple[int, int], tfl_type: str, redraw: bool = True):
+        """Постройка светофора на поле.
+
+        Args:
+            pos: Координаты тала на поле.
+            tfl_type: Тип светофора.
+            redraw: Перерисовать ли поле сразу. При расстановке многих светофоров поле лучше перерисовать один раз.
+        """
         field: Field = self.get_sprite('field')
         if not field.can_build_traffic_light(pos) or pos in field.traffic_lights:
             return
@@ -252,11 +359,12 @@ class City(State):
         uuid: str = self.generate_uuid_for_traffic_light()
         field.traffic_lights[pos] = TrafficLight(self.game, tfl_type,
                                                  uuid, field=field)
-        field.update_view()
+        if redraw:
+            field.update_view()
 
         data = TrafficLightData(tfl_type, uuid)
 
-        self.game.pinger.traffic_lights_data.append(data)
+        field.registry.add(data, pos)
         field.traffic_lights[pos].data = data
 
     def remove_traffic_light(self, pos: tuple[int, int]):
@@ -269,13 +377,7 @@ class City(State):
         if not field.can_build_traffic_light(pos) or pos not in field.traffic_lights:
             return
 
-        uuid: str = field.traffic_lights[pos].data.uuid
-        for i in range(len(self.game.pinger.traffic_lights_data)):
-            if self.game.pinger.traffic_lights_data[i].uuid == uuid:
-                del self.game.pinger.traffic_lights_data[i]
-                break
-
-        field.traffic_lights.pop(pos)
+        field.registry.remove(field.traffic_lights.pop(pos).data.uuid)
         field.update_view()
 
     def generate_uuid_for_traffic_light(self) -> str:
@@ -305,15 +407,9 @@ class City(State):
             "solarshade", "lunardrift", "nebulapath", "cosmicwhirl", "staticveil", "thunderchime",
             "frostbite", "emberglow", "stormchaser"
         ]
-        contains: bool = True
         uuid = f'{choice(name)}_{randint(1, 999)}'
-        while contains:
-            contains: bool = False
-            for traffic_light in self.game.pinger.traffic_lights_data:
-                if traffic_light.uuid == uuid:
-                    contains = True
-                    uuid = f'{choice(name)}_{randint(1, 999)}'
-                    break
+        while uuid in self.game.pinger.registry:
+            uuid = f'{choice(name)}_{randint(1, 999)}'
 
         return uuid
 
@@ -323,11 +419,9 @@ class City(State):
         field: Field = self.get_sprite('field')
         if pg.key.get_pressed()[pg.K_u]:
             field.perspective_angle = min(field.perspective_angle + 0.1, pi / 4)
-            field.view_field = {}
             field.update_view()
         if pg.key.get_pressed()[pg.K_j]:
             field.perspective_angle = max(field.perspective_angle - 0.1, 0.3)
-            field.view_field = {}
             field.update_view()
 
         if 5 in self.game.omitted_mouse_buttons:
@@ -1,6 +1,6 @@
 """Модуль создания города.
 """
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 from random import choice
 from os import path, listdir
 
@@ -38,6 +38,7 @@ class CreateCity(State):
             Option(InBlockText(self.game, 'Размер карты: Небольшой', 16, (255, 255, 255)), value='small'),
             Option(InBlockText(self.game, 'Размер карты: Средний', 16, (255, 255, 255)), value='medium'),
             Option(InBlockText(self.game, 'Размер карты: Большой', 16, (255, 255, 255)), value='large'),
+            Option(InBlockText(self.game, 'Размер карты: Бесконечный', 16, (255, 255, 255)), value='infinite'),
         ]
         self.add_sprite('field_size', ChoiceOfSeveralOptions(self.game, (510, 540), (900, 70),
                                                              field_sizes))
@@ -61,10 +62,11 @@ class CreateCity(State):
             seed_input: Input = self.get_sprite('seed_input')
             field_size: ChoiceOfSeveralOptions = self.get_sprite('field_size')
 
-            field_sizes: dict[str, tuple[int, int]] = {
+            field_sizes: dict[str, Optional[tuple[int, int]]] = {
                 'small': (30, 30),
                 'medium': (50, 50),
-                'large': (80, 80)
+                'large': (80, 80),
+                'infinite': None
             }
 
             context: dict = {
@@ -1,12 +1,14 @@
 """Модуль открытия города.
 """
 import json
-from typing import TYPE_CHECKING
+import logging
+from typing import TYPE_CHECKING, Optional
 from os import path, listdir
 
 from src.state import State
 
 from src.sprites import Button, InBlockText, ButtonStatus, ChoiceOfSeveralOptions, Text, TextAlign, Option
+from src.modules import MapLoader
 
 if TYPE_CHECKING:
     from src.game import Game
@@ -14,6 +16,10 @@ if TYPE_CHECKING:
 
 class OpenCity(State):
     """Класс сцены выбором города.
+
+    Карта выбранного города заранее генерируется в фоне и попадает в MapCache,
+    поэтому при открытии города генерация не нужна. Генерацию нельзя прервать, поэтому город,
+    выбранный во время подготовки другого, запоминается и подготавливается следом.
     """
 
     def __init__(self, game: 'Game'):
@@ -23,6 +29,8 @@ class OpenCity(State):
             game (Game): Экземпляр игры
         """
         super().__init__(game)
+        self._map_loader: Optional[MapLoader] = None
+        self._next_city: Optional[str] = None
 
     def boot(self):
         """Инициализация сцены.
@@ -55,7 +63,33 @@ class OpenCity(State):
             options = [Option(InBlockText(self.game, 'Ни одного города не существует', 16, (128, 128, 128)), 'null')]
 
         self.add_sprite('choice_city', ChoiceOfSeveralOptions(self.game, (510, 540), (900, 70),
-                                                              options))
+                                                              options, self.prepare_city_map))
+
+    def prepare_city_map(self, city: str):
+        """Фоновая подготовка карты города, чтобы при открытии она бралась из кэша.
+
+        Если в это время готовится карта другого города, выбранный город запоминается
+        и подготавливается в update() после окончания текущей генерации.
+
+        Args:
+            city: Имя файла города.
+        """
+        if city == 'null':
+            return
+        if self._map_loader is not None and not self._map_loader.is_done():
+            self._next_city = city
+            return
+        self._next_city = None
+        try:
+            with open(path.join('saves', 'cities', city)) as file:
+                data: dict = json.loads(file.read())
+            if data['size'] is None:
+                return
+            self._map_loader = MapLoader(tuple[int, int](data['size']), data['seed'])
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning('Не удалось прочитать город "%s": %s', city, e)
+            return
+        self._map_loader.start()
 
     def on_open_city_button_pressed(self, status: ButtonStatus, context: str):
         """Действие при нажатии на одну из кнопок для открытия города.
@@ -70,10 +104,12 @@ class OpenCity(State):
             self.game.change_state('City', json.loads(file.read()))
 
     def update(self):
-        pass
+        if self._next_city is not None and self._map_loader.is_done():
+            self.prepare_city_map(self._next_city)
 
     def enter(self):
-        pass
+        choice: ChoiceOfSeveralOptions = self.get_sprite('choice_city')
+        self.prepare_city_map(choice.options[choice.current_option].value)
 
     def exit(self):
         pass
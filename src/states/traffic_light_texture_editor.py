@@ -5,7 +5,9 @@ import json
 
 from src.state import State
 
-from src.sprites import Pixelart, Button, InBlockText, ButtonStatus, Container, Input, Formatting, Text, TextAlign
+from src.sprites import Pixelart, Button, InBlockText, ButtonStatus, Container, Input, Formatting, Text, TextAlign, \
+    TrafficLight
+from src.modules import TextureRegistry
 
 if TYPE_CHECKING:
     from src.game import Game
@@ -74,6 +76,8 @@ class TrafficLightTextureEditor(State):
 
         with open(path.join('saves', 'traffic_lights', 'textures', f'{texture_name}.json'), 'w') as file:
             file.write(json.dumps(texture))
+        TextureRegistry.invalidate(texture_name)
+        TrafficLight.clear_cache()
 
         create_texture_info: Text = self.get_sprite('create_texture_info')
         create_texture_info.text = 'Текстура создана'
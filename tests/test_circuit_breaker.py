@@ -0,0 +1,40 @@
+import time
+import unittest
+
+from src.modules import TrafficLightData
+from src.pinger import Pinger
+from src.pinger.circuit_breaker import CircuitState
+from src.pinger.mock_service import MockTrafficLightService
+
+
+class CircuitBreakerServerErrorTest(unittest.TestCase):
+    """Предохранитель размыкается, если сервис отвечает только ошибками 5xx.
+    """
+
+    def setUp(self):
+        self.service: MockTrafficLightService = MockTrafficLightService(port=8081, error_rate=1)
+        self.service.start()
+        self.pinger: Pinger = Pinger(retries=0, failure_threshold=3, recovery_time=0.2)
+        self.pinger.add_traffic_light(TrafficLightData('basic', 'u0'))
+
+    def tearDown(self):
+        self.pinger.close()
+        self.service.stop()
+
+    def test_server_errors_open_circuit(self):
+        for _ in range(5):
+            self.pinger.ping()
+        self.assertEqual(self.pinger.get_circuit_breaker(self.service.url).get_state(), CircuitState.OPEN)
+        self.assertEqual(self.service.get_stats(), {500: 3})
+
+    def test_server_error_on_probe_reopens_circuit(self):
+        for _ in range(3):
+            self.pinger.ping()
+        time.sleep(0.3)
+        self.pinger.ping()
+        self.assertEqual(self.pinger.get_circuit_breaker(self.service.url).get_state(), CircuitState.OPEN)
+        self.assertEqual(self.service.get_stats(), {500: 4})
+
+
+if __name__ == '__main__':
+    unittest.main()
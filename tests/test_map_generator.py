@@ -0,0 +1,49 @@
+import hashlib
+import unittest
+
+import numpy as np
+
+from src.modules import InfiniteMap, MapGenerator
+
+
+def get_hash(grid: np.ndarray) -> str:
+    return hashlib.sha256(np.ascontiguousarray(grid, dtype=np.uint8).tobytes()).hexdigest()
+
+
+class MapGeneratorSeedTest(unittest.TestCase):
+    """Карта по seed не меняется между версиями Python и оптимизациями генератора.
+
+    Генератор повторяет последовательность вызовов random.Random, поэтому любое изменение
+    в ней или в random самого Python меняет карты уже сохранённых городов. Ожидаемые хэши
+    посчитаны исходным генератором на словаре тайлов. Если хэш изменился намеренно,
+    нужно увеличить MapGenerator.version, чтобы сбросить MapCache.
+    """
+    maps: dict[tuple[tuple[int, int], int], str] = {
+        ((3, 3), 0): 'f82082d5395ac424289dd63fe54546cdd4ad291e4d21420f364acadbcb7d30c4',
+        ((21, 17), 1): '0e13050cdb1e4fc5b8f8a9e43f4045fe8887a5a0c060eb41369d3a70c17041de',
+        ((64, 64), 12345): 'ee02e707c214812e558cb47c4d788ecdacc309f0992bc53e6f6d08a5302572ea',
+        ((150, 90), 7): 'cd7e66ec1c43440747bc20cd340d27e5f14de8098adcc59deea648c7e17b48ff',
+        ((301, 301), 2024): '25fdceee31fbfd232b181f65313d8baa906c3df31b6239e4a78195ead88caa4c',
+    }
+    chunks: dict[tuple[int, int], str] = {
+        (0, 0): '197ca9acfcdb66ada4a77a04479c33269400d6e744dc1d1431401321bfa023ef',
+        (-3, 5): '43c3ac52dd78ebfdedb67e6c668f99e15e0ce2c7a7e5a3004a1e2cb135fff0b6',
+    }
+
+    def test_map_for_seed_is_fixed(self):
+        for (size, seed), expected in self.maps.items():
+            with self.subTest(size=size, seed=seed):
+                self.assertEqual(get_hash(MapGenerator(size, seed).generate_map().grid), expected)
+
+    def test_infinite_map_chunk_for_seed_is_fixed(self):
+        infinite_map: InfiniteMap = InfiniteMap(7)
+        try:
+            for chunk, expected in self.chunks.items():
+                with self.subTest(chunk=chunk):
+                    self.assertEqual(get_hash(infinite_map.load_chunk(chunk)), expected)
+        finally:
+            infinite_map.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import tempfile
+import time
+import unittest
+from typing import Callable, Optional
+
+from src.modules import NoteType, TrafficLightData
+from src.pinger import Checker, Pinger
+from src.pinger.mock_service import MockTrafficLightService
+
+
+def hanging_check(_request: dict, _response: dict) -> tuple[bool, Optional[str]]:
+    time.sleep(60)
+    return True, None
+
+
+def raising_check(_request: dict, _response: dict) -> tuple[bool, Optional[str]]:
+    raise RuntimeError('Проверка сломана')
+
+
+def failing_batch_check(requests: list[dict], _responses: list[dict]) -> list[tuple[bool, Optional[str]]]:
+    return [(False, 'Неверное состояние')] * len(requests)
+
+
+def passing_check(_request: dict, _response: dict) -> tuple[bool, Optional[str]]:
+    return True, None
+
+
+def exiting_check(_request: dict, _response: dict) -> tuple[bool, Optional[str]]:
+    """Завершает процесс пула при первом вызове, пока нет файла-метки.
+    """
+    marker: str = os.environ['TRAFFIC_LIGHTS_TEST_MARKER']
+    if not os.path.exists(marker):
+        with open(marker, 'w', encoding='utf-8'):
+            pass
+        os._exit(1)
+    return True, None
+
+
+class ProcessChecksTest(unittest.TestCase):
+    """Проверки в пуле процессов: зависшая проверка и упавший процесс не скрывают результаты других типов.
+    """
+
+    def setUp(self):
+        checker: Checker = Checker()
+        self._functions: dict[str, Callable] = dict(checker.functions)
+        self._batch_functions: dict[str, Callable] = dict(checker.batch_functions)
+        self.service: MockTrafficLightService = MockTrafficLightService(port=8081)
+        self.service.start()
+        self.pinger: Pinger = Pinger(retries=0, check_in_processes=True, check_timeout=1)
+        for i, tfl_type in enumerate(('basic', 'arrow', 'pedestrian_crossing')):
+            self.pinger.add_traffic_light(TrafficLightData(tfl_type, f'u{i}'))
+
+    def tearDown(self):
+        self.pinger.close()
+        self.service.stop()
+        checker: Checker = Checker()
+        checker.functions.clear()
+        checker.functions.update(self._functions)
+        checker.batch_functions.clear()
+        checker.batch_functions.update(self._batch_functions)
+
+    def get_note(self, uuid: str) -> tuple[Optional[NoteType], Optional[str]]:
+        note = self.pinger.registry.get(uuid).note
+        return note.get_level(), note.note
+
+    def ping_until(self, condition: Callable[[], bool], timeout: float = 30) -> bool:
+        deadline: float = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self.pinger.ping()
+            if condition():
+                return True
+            time.sleep(0.2)
+        return False
+
+    def test_hanging_check_does_not_hide_other_types(self):
+        checker: Checker = Checker()
+        checker('basic')(hanging_check)
+        checker('arrow')(raising_check)
+        checker.batch('pedestrian_crossing')(failing_batch_check)
+
+        expected: dict[str, tuple[NoteType, str]] = {
+            'u0': (NoteType.QUESTION_ERROR, 'Проверка светофора типа basic не выполнилась за 1 с.'),
+            'u1': (NoteType.QUESTION_ERROR, 'Проверка светофора типа arrow завершилась с ошибкой.'),
+            'u2': (NoteType.EXCLAMATION_ERROR, 'Неверное состояние'),
+        }
+        self.ping_until(lambda: all(self.get_note(uuid) == note for uuid, note in expected.items()))
+        for uuid, note in expected.items():
+            self.assertEqual(self.get_note(uuid), note)
+
+        # Итог проверки остаётся в записке, пока не придёт результат следующей
+        for _ in range(5):
+            self.pinger.ping()
+            self.assertEqual(self.get_note('u2'), expected['u2'])
+            time.sleep(0.2)
+
+    def test_dead_worker_is_replaced(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.environ['TRAFFIC_LIGHTS_TEST_MARKER'] = os.path.join(directory, 'exited')
+            try:
+                checker: Checker = Checker()
+                checker('basic')(exiting_check)
+                checker('arrow')(passing_check)
+                checker.batch('pedestrian_crossing')(failing_batch_check)
+
+                self.assertTrue(self.ping_until(lambda: self.get_note('u0')[0] == NoteType.QUESTION_ERROR))
+                self.assertIn('завершился аварийно', self.get_note('u0')[1])
+                self.assertTrue(self.ping_until(lambda: self.get_note('u0') == (None, None)
+                                                and self.get_note('u2')[0] == NoteType.EXCLAMATION_ERROR))
+            finally:
+                del os.environ['TRAFFIC_LIGHTS_TEST_MARKER']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import gc
+import unittest
+
+from src.modules import NoteType, TrafficLightData, TrafficLightStateStore
+
+
+class NoteSlotReuseTest(unittest.TestCase):
+    """Записка, пережившая свой светофор, не видит светофор, которому достался освободившийся слот.
+    """
+
+    def test_note_outliving_traffic_light_keeps_its_slot(self):
+        store: TrafficLightStateStore = TrafficLightStateStore()
+        traffic_light: TrafficLightData = TrafficLightData('basic', 'old', store)
+        note = traffic_light.note
+        note.set_level(NoteType.CLOUD_ERROR)
+        note.note = 'Сервис недоступен'
+        del traffic_light
+        gc.collect()
+
+        other: TrafficLightData = TrafficLightData('basic', 'new', store)
+        self.assertEqual(other.note.get_level(), NoteType.WAIT_MARK)
+        self.assertIsNone(other.note.note)
+        self.assertEqual(note.get_level(), NoteType.CLOUD_ERROR)
+        self.assertEqual(note.note, 'Сервис недоступен')
+
+        note.set_level(NoteType.EXCLAMATION_ERROR)
+        note.note = 'Ошибка'
+        self.assertEqual(other.note.get_level(), NoteType.WAIT_MARK)
+        self.assertIsNone(other.note.note)
+
+    def test_slot_is_reused_after_traffic_light_and_note_are_deleted(self):
+        store: TrafficLightStateStore = TrafficLightStateStore()
+        traffic_light: TrafficLightData = TrafficLightData('basic', 'old', store)
+        note = traffic_light.note
+        note.note = 'Сервис недоступен'
+        slot: int = traffic_light.slot
+        del traffic_light, note
+        gc.collect()
+        self.assertEqual(len(store), 0)
+
+        other: TrafficLightData = TrafficLightData('basic', 'new', store)
+        self.assertEqual(other.slot, slot)
+        self.assertEqual(other.note.get_level(), NoteType.WAIT_MARK)
+        self.assertIsNone(other.note.note)
+
+
+if __name__ == '__main__':
+    unittest.main()